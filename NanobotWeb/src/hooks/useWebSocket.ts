@@ -133,256 +133,262 @@ export function useWebSocket(serverUrl: string, streamingEnabled: boolean = true
 
       addFrame('in', raw, parsed.type);
 
-      switch (parsed.type) {
-        case 'history': {
-          if ('messages' in parsed && parsed.messages) {
-            setMessages(parsed.messages.map(m => {
-              const isSystem = m.role === 'assistant' && m.content.startsWith('[System]');
-              return {
-                id: generateId(),
-                content: m.content,
-                isFromUser: m.role === 'user',
-                timestamp: new Date(),
-                isSystem,
-              };
-            }));
+      // The server may coalesce frames into one (api.batchMs); handle each in order
+      const handle = (parsed: IncomingMessage) => {
+        switch (parsed.type) {
+          case 'history': {
+            if ('messages' in parsed && parsed.messages) {
+              setMessages(parsed.messages.map(m => {
+                const isSystem = m.role === 'assistant' && m.content.startsWith('[System]');
+                return {
+                  id: generateId(),
+                  content: m.content,
+                  isFromUser: m.role === 'user',
+                  timestamp: new Date(),
+                  isSystem,
+                };
+              }));
+            }
+            break;
           }
-          break;
-        }
-        case 'response': {
-          if ('content' in parsed) {
-            // If streaming already delivered this message, skip the duplicate
-            if (streamDelivered.current) {
-              streamDelivered.current = false;
-            } else {
+          case 'response': {
+            if ('content' in parsed) {
+              // If streaming already delivered this message, skip the duplicate
+              if (streamDelivered.current) {
+                streamDelivered.current = false;
+              } else {
+                setMessages(prev => [...prev, {
+                  id: generateId(),
+                  content: parsed.content,
+                  isFromUser: false,
+                  timestamp: new Date(),
+                }]);
+              }
+              setWaitingForResponse(false);
+              setAgentStatus('idle');
+              setAgentStatusDetail('');
+              setEvents([]);
+            }
+            break;
+          }
+          case 'error': {
+            if ('content' in parsed) {
               setMessages(prev => [...prev, {
                 id: generateId(),
-                content: parsed.content,
+                content: `Error: ${parsed.content}`,
                 isFromUser: false,
                 timestamp: new Date(),
               }]);
+              setWaitingForResponse(false);
+              setAgentStatus('idle');
+              setAgentStatusDetail('');
             }
-            setWaitingForResponse(false);
-            setAgentStatus('idle');
-            setAgentStatusDetail('');
-            setEvents([]);
-          }
-          break;
-        }
-        case 'error': {
-          if ('content' in parsed) {
-            setMessages(prev => [...prev, {
-              id: generateId(),
-              content: `Error: ${parsed.content}`,
-              isFromUser: false,
-              timestamp: new Date(),
-            }]);
-            setWaitingForResponse(false);
-            setAgentStatus('idle');
-            setAgentStatusDetail('');
+            break;
           }
-          break;
-        }
 
-        // --- Streaming messages ---
-        case 'stream_start': {
-          // Skip task-tagged streams (heartbeat/cron) — they don't belong in chat
-          if ((parsed as unknown as Record<string, unknown>).task_id) break;
-          streamingMsgId.current = parsed.id;
-          streamBuffer.current = '';
-          if (streamingEnabledRef.current) {
-            // Create a placeholder message for progressive rendering
-            const msgId = `stream-${parsed.id}`;
-            setMessages(prev => [...prev, {
-              id: msgId,
-              content: '',
-              isFromUser: false,
-              timestamp: new Date(),
-              isStreaming: true,
-            }]);
-            setWaitingForResponse(false);
+          // --- Streaming messages ---
+          case 'stream_start': {
+            // Skip task-tagged streams (heartbeat/cron) — they don't belong in chat
+            if ((parsed as unknown as Record<string, unknown>).task_id) break;
+            streamingMsgId.current = parsed.id;
+            streamBuffer.current = '';
+            if (streamingEnabledRef.current) {
+              // Create a placeholder message for progressive rendering
+              const msgId = `stream-${parsed.id}`;
+              setMessages(prev => [...prev, {
+                id: msgId,
+                content: '',
+                isFromUser: false,
+                timestamp: new Date(),
+                isStreaming: true,
+              }]);
+              setWaitingForResponse(false);
+            }
+            break;
           }
-          break;
-        }
-        case 'stream_chunk': {
-          if (parsed.id !== streamingMsgId.current) break;
-          streamBuffer.current += parsed.delta;
-          if (streamingEnabledRef.current) {
-            const accumulated = streamBuffer.current;
-            const msgId = `stream-${parsed.id}`;
-            setMessages(prev =>
-              prev.map(m => m.id === msgId ? { ...m, content: accumulated } : m)
-            );
+          case 'stream_chunk': {
+            if (parsed.id !== streamingMsgId.current) break;
+            streamBuffer.current += parsed.delta;
+            if (streamingEnabledRef.current) {
+              const accumulated = streamBuffer.current;
+              const msgId = `stream-${parsed.id}`;
+              setMessages(prev =>
+                prev.map(m => m.id === msgId ? { ...m, content: accumulated } : m)
+              );
+            }
+            break;
           }
-          break;
-        }
-        case 'stream_end': {
-          if (parsed.id !== streamingMsgId.current) break;
-          const finalContent = streamBuffer.current;
-          const msgId = `stream-${parsed.id}`;
-          streamingMsgId.current = null;
-          streamBuffer.current = '';
-          streamDelivered.current = true;
-
-          if (streamingEnabledRef.current) {
-            // Mark the streaming message as complete
-            setMessages(prev =>
-              prev.map(m => m.id === msgId
-                ? { ...m, content: finalContent, isStreaming: false }
-                : m
-              )
-            );
-          } else {
-            // Non-streaming mode: show the full message at once
-            setMessages(prev => [...prev, {
-              id: msgId,
-              content: finalContent,
-              isFromUser: false,
-              timestamp: new Date(),
-            }]);
+          case 'stream_end': {
+            if (parsed.id !== streamingMsgId.current) break;
+            const finalContent = streamBuffer.current;
+            const msgId = `stream-${parsed.id}`;
+            streamingMsgId.current = null;
+            streamBuffer.current = '';
+            streamDelivered.current = true;
+
+            if (streamingEnabledRef.current) {
+              // Mark the streaming message as complete
+              setMessages(prev =>
+                prev.map(m => m.id === msgId
+                  ? { ...m, content: finalContent, isStreaming: false }
+                  : m
+                )
+              );
+            } else {
+              // Non-streaming mode: show the full message at once
+              setMessages(prev => [...prev, {
+                id: msgId,
+                content: finalContent,
+                isFromUser: false,
+                timestamp: new Date(),
+              }]);
+            }
+            // Don't reset waitingForResponse here — the 'response' message
+            // from the bus still handles that (stream_end fires mid-loop
+            // when tool calls follow). The final 'response' resets everything.
+            break;
           }
-          // Don't reset waitingForResponse here — the 'response' message
-          // from the bus still handles that (stream_end fires mid-loop
-          // when tool calls follow). The final 'response' resets everything.
-          break;
-        }
 
-        case 'link_preview_result': {
-          const preview: LinkPreviewData = {
-            url: parsed.url,
-            title: parsed.title,
-            description: parsed.description,
-            image: parsed.image,
-            favicon: parsed.favicon,
-          };
-          setLinkPreviews(prev => new Map(prev).set(parsed.url, preview));
-          break;
-        }
+          case 'link_preview_result': {
+            const preview: LinkPreviewData = {
+              url: parsed.url,
+              title: parsed.title,
+              description: parsed.description,
+              image: parsed.image,
+              favicon: parsed.favicon,
+            };
+            setLinkPreviews(prev => new Map(prev).set(parsed.url, preview));
+            break;
+          }
 
-        case 'workspace_list_result': {
-          if (parsed.error) {
-            setWorkspaceError(parsed.error);
-          } else {
-            setWorkspaceEntries(prev => new Map(prev).set(parsed.path, parsed.entries));
-            setWorkspaceError(null);
+          case 'workspace_list_result': {
+            if (parsed.error) {
+              setWorkspaceError(parsed.error);
+            } else {
+              setWorkspaceEntries(prev => new Map(prev).set(parsed.path, parsed.entries));
+              setWorkspaceError(null);
+            }
+            break;
           }
-          break;
-        }
 
-        case 'workspace_read_result': {
-          if (parsed.error) {
-            setWorkspaceError(parsed.error);
-          } else {
-            setWorkspaceFileContent({ path: parsed.path, content: parsed.content });
-            setWorkspaceError(null);
+          case 'workspace_read_result': {
+            if (parsed.error) {
+              setWorkspaceError(parsed.error);
+            } else {
+              setWorkspaceFileContent({ path: parsed.path, content: parsed.content });
+              setWorkspaceError(null);
+            }
+            break;
           }
-          break;
-        }
 
-        case 'workspace_write_result': {
-          if (parsed.error) {
-            setWorkspaceSaveStatus('error');
-            setWorkspaceError(parsed.error);
-          } else {
-            setWorkspaceSaveStatus('saved');
-            setWorkspaceError(null);
-            setTimeout(() => setWorkspaceSaveStatus('idle'), 2000);
+          case 'workspace_write_result': {
+            if (parsed.error) {
+              setWorkspaceSaveStatus('error');
+              setWorkspaceError(parsed.error);
+            } else {
+              setWorkspaceSaveStatus('saved');
+              setWorkspaceError(null);
+              setTimeout(() => setWorkspaceSaveStatus('idle'), 2000);
+            }
+            break;
           }
-          break;
-        }
 
-        case 'event': {
-          if ('category' in parsed && 'event' in parsed) {
-            // Skip event cards for task-tagged agent events (heartbeat/cron)
-            const taskId = parsed.data?.task_id as string | undefined;
-            if (taskId && parsed.category === 'agent') break;
-
-            const record: AgentEventRecord = {
-              id: generateId(),
-              category: parsed.category,
-              event: parsed.event,
-              data: parsed.data ?? {},
-              timestamp: new Date(),
-            };
-            setEvents(prev => {
-              const next = [...prev, record];
-              return next.length > MAX_EVENTS ? next.slice(-MAX_EVENTS) : next;
-            });
-
-            // Update agent status based on event type
-            if (parsed.category === 'agent') {
-              switch (parsed.event) {
-                case 'thinking_started':
-                  setAgentStatus('thinking');
-                  setAgentStatusDetail('');
-                  break;
-                case 'tool_call':
-                  setAgentStatus('tool_call');
-                  setAgentStatusDetail(String(parsed.data?.name ?? ''));
-                  break;
-                case 'thinking_finished':
-                  // Reset everything — covers both user-initiated and
-                  // background processing (heartbeat, cron) that don't
-                  // produce a WebSocket "response" frame.
-                  setWaitingForResponse(false);
+          case 'event': {
+            if ('category' in parsed && 'event' in parsed) {
+              // Skip event cards for task-tagged agent events (heartbeat/cron)
+              const taskId = parsed.data?.task_id as string | undefined;
+              if (taskId && parsed.category === 'agent') break;
+
+              const record: AgentEventRecord = {
+                id: generateId(),
+                category: parsed.category,
+                event: parsed.event,
+                data: parsed.data ?? {},
+                timestamp: new Date(),
+              };
+              setEvents(prev => {
+                const next = [...prev, record];
+                return next.length > MAX_EVENTS ? next.slice(-MAX_EVENTS) : next;
+              });
+
+              // Update agent status based on event type
+              if (parsed.category === 'agent') {
+                switch (parsed.event) {
+                  case 'thinking_started':
+                    setAgentStatus('thinking');
+                    setAgentStatusDetail('');
+                    break;
+                  case 'tool_call':
+                    setAgentStatus('tool_call');
+                    setAgentStatusDetail(String(parsed.data?.name ?? ''));
+                    break;
+                  case 'thinking_finished':
+                    // Reset everything — covers both user-initiated and
+                    // background processing (heartbeat, cron) that don't
+                    // produce a WebSocket "response" frame.
+                    setWaitingForResponse(false);
+                    setAgentStatus('idle');
+                    setAgentStatusDetail('');
+                    setEvents([]);
+                    break;
+                }
+              } else if (parsed.category === 'heartbeat') {
+                setAgentStatus('heartbeat');
+                setAgentStatusDetail(String(parsed.data?.summary ?? ''));
+              } else if (parsed.category === 'subagent') {
+                if (parsed.event === 'spawned') {
+                  setAgentStatus('subagent');
+                  setAgentStatusDetail(String(parsed.data?.label ?? ''));
+                } else if (parsed.event === 'completed') {
                   setAgentStatus('idle');
                   setAgentStatusDetail('');
-                  setEvents([]);
-                  break;
-              }
-            } else if (parsed.category === 'heartbeat') {
-              setAgentStatus('heartbeat');
-              setAgentStatusDetail(String(parsed.data?.summary ?? ''));
-            } else if (parsed.category === 'subagent') {
-              if (parsed.event === 'spawned') {
-                setAgentStatus('subagent');
-                setAgentStatusDetail(String(parsed.data?.label ?? ''));
-              } else if (parsed.event === 'completed') {
-                setAgentStatus('idle');
-                setAgentStatusDetail('');
+                }
               }
             }
+            break;
           }
-          break;
-        }
 
-        // --- Task messages ---
-        case 'task_list_result': {
-          if ('tasks' in parsed) {
-            setTasks(parsed.tasks);
+          // --- Task messages ---
+          case 'task_list_result': {
+            if ('tasks' in parsed) {
+              setTasks(parsed.tasks);
+            }
+            break;
           }
-          break;
-        }
-        case 'task_session_result': {
-          if ('task_id' in parsed && 'messages' in parsed) {
-            setTaskSession({ taskId: parsed.task_id, messages: parsed.messages });
+          case 'task_session_result': {
+            if ('task_id' in parsed && 'messages' in parsed) {
+              setTaskSession({ taskId: parsed.task_id, messages: parsed.messages });
+            }
+            break;
           }
-          break;
-        }
-        case 'task_event': {
-          // Debounced refresh of task list on lifecycle events
-          clearTimeout(taskRefreshTimer.current);
-          taskRefreshTimer.current = setTimeout(() => {
-            if (wsRef.current?.readyState === WebSocket.OPEN) {
-              wsRef.current.send(JSON.stringify({ type: 'task_list' }));
+          case 'task_event': {
+            // Debounced refresh of task list on lifecycle events
+            clearTimeout(taskRefreshTimer.current);
+            taskRefreshTimer.current = setTimeout(() => {
+              if (wsRef.current?.readyState === WebSocket.OPEN) {
+                wsRef.current.send(JSON.stringify({ type: 'task_list' }));
+              }
+            }, 300);
+            break;
+          }
+          case 'system_message': {
+            if ('content' in parsed) {
+              const sysTaskId = 'task_id' in parsed ? String(parsed.task_id) : undefined;
+              setMessages(prev => [...prev, {
+                id: generateId(),
+                content: parsed.content,
+                isFromUser: false,
+                timestamp: new Date(),
+                isSystem: true,
+                taskId: sysTaskId,
+              }]);
             }
-          }, 300);
-          break;
-        }
-        case 'system_message': {
-          if ('content' in parsed) {
-            const sysTaskId = 'task_id' in parsed ? String(parsed.task_id) : undefined;
-            setMessages(prev => [...prev, {
-              id: generateId(),
-              content: parsed.content,
-              isFromUser: false,
-              timestamp: new Date(),
-              isSystem: true,
-              taskId: sysTaskId,
-            }]);
+            break;
           }
-          break;
         }
+      };
+      for (const item of parsed.type === 'batch' ? parsed.items : [parsed]) {
+        handle(item);
       }
     };
 
@@ -135,8 +135,14 @@ export interface IncomingSystemMessage {
   content: string;
 }
 
+// Several frames coalesced by the server (api.batchMs > 0)
+export interface IncomingBatch {
+  type: 'batch';
+  items: IncomingMessage[];
+}
+
 export type IncomingMessage =
-  | IncomingResponse | IncomingHistory | IncomingError | IncomingEvent
+  | IncomingBatch | IncomingResponse | IncomingHistory | IncomingError | IncomingEvent
   | IncomingStreamStart | IncomingStreamChunk | IncomingStreamEnd
   | IncomingLinkPreviewResult
   | IncomingWorkspaceListResult | IncomingWorkspaceReadResult | IncomingWorkspaceWriteResult
@@ -8,6 +8,27 @@ from typing import Any
 
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.skills import SkillsLoader
+from nanobot.utils.helpers import json_char_len
+
+
+class MessageBuffer(list):
+    """
+    A message list that keeps a running estimate of its serialized size.
+
+    ``total_chars`` is updated on append(), which is how ContextBuilder grows
+    the list during a turn, so budget checks don't have to re-walk it.
+    Other in-place mutations are not tracked.
+    """
+
+    def __init__(self, messages: list[dict[str, Any]] = (), total_chars: int | None = None):
+        super().__init__(messages)
+        self.total_chars = (
+            total_chars if total_chars is not None else sum(json_char_len(m) for m in self)
+        )
+
+    def append(self, msg: dict[str, Any]) -> None:
+        super().append(msg)
+        self.total_chars += json_char_len(msg)
 
 
 class ContextBuilder:
@@ -1,29 +1,50 @@
 """Agent loop: the core processing engine."""
 
 import asyncio
-import json
+import itertools
+import secrets
 import time
-import uuid
+import weakref
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
-from nanobot.agent.context import ContextBuilder
+from nanobot.agent.context import ContextBuilder, MessageBuffer
 from nanobot.agent.subagent import SubagentManager
 from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
 from nanobot.agent.tools.message import MessageTool
-from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.registry import TOOL_CONTEXT, ToolRegistry
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
-from nanobot.bus.event_bus import AgentEvent, EventBus
+from nanobot.bus.event_bus import AgentEvent, EventBus, StreamEventBatcher
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider, LLMResponse
+from nanobot.providers.base import LLMProvider, LLMResponse, ProviderCapabilities
 from nanobot.session.manager import SessionManager
+from nanobot.utils import fastjson
+from nanobot.utils.helpers import json_char_len, strip_think_tags
 
+# Stream message ids: a per-process random prefix plus a counter, so ids stay
+# unique across restarts without paying for uuid4() on every LLM call.
+_MSG_ID_PREFIX = secrets.token_hex(3)
+_next_msg_seq = itertools.count().__next__
+
+# task_id of the message being processed by the current worker (event tagging)
+_current_task_id: ContextVar[str | None] = ContextVar("current_task_id", default=None)
+
+
+def _make_tool_call(call_id: str, name: str, arguments: str) -> dict[str, Any]:
+    """Build an OpenAI-format tool_calls entry (arguments must be a JSON string)."""
+    return {"id": call_id, "type": "function", "function": {"name": name, "arguments": arguments}}
+
+
+def _preview(text: str, limit: int) -> str:
+    """Shorten text for log lines."""
+    return text if len(text) <= limit else text[:limit] + "..."
 
 class AgentLoop:
     """
@@ -53,6 +74,7 @@ class AgentLoop:
         max_tokens: int = 4096,
         temperature: float = 0.7,
         context_window: int | None = None,
+        concurrency: int = 4,
     ):
         from nanobot.config.schema import ExecToolConfig, WebSearchConfig
         self.bus = bus
@@ -65,9 +87,11 @@ class AgentLoop:
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
         self.event_bus = event_bus
+        self._stream_events = StreamEventBatcher(event_bus) if event_bus else None
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.context_window = context_window  # None = auto-discover
+        self.concurrency = max(1, concurrency)
 
         self.context = ContextBuilder(workspace)
         self.sessions = session_manager or SessionManager(workspace)
@@ -86,24 +110,33 @@ class AgentLoop:
         )
 
         self._running = False
-        self._current_task_id: str | None = None
+        self._stop_event = asyncio.Event()
+        # One lock per active session so its messages are handled in order
+        self._session_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        # Discovered provider capabilities, memoized until a context overflow
+        self._caps: ProviderCapabilities | None = None
+        self._caps_lock = asyncio.Lock()
         self._register_default_tools()
 
-    async def _emit(self, event: str, data: dict[str, Any] | None = None) -> None:
+    def _emit(self, event: str, data: dict[str, Any] | None = None) -> None:
         """Emit an agent event if the event bus is available."""
         if self.event_bus:
             payload = dict(data) if data else {}
-            if self._current_task_id:
-                payload["task_id"] = self._current_task_id
-            await self.event_bus.publish(AgentEvent("agent", event, payload))
-
-    async def _emit_stream(self, event: str, data: dict[str, Any]) -> None:
-        """Emit a stream event via the event bus."""
-        if self.event_bus:
+            task_id = _current_task_id.get()
+            if task_id:
+                payload["task_id"] = task_id
+            self.event_bus.publish(AgentEvent("agent", event, payload))
+
+    def _emit_stream(self, event: str, data: dict[str, Any]) -> None:
+        """Emit a stream event via the event bus (chunks are batched)."""
+        if self._stream_events:
             payload = dict(data)
-            if self._current_task_id:
-                payload["task_id"] = self._current_task_id
-            await self.event_bus.publish(AgentEvent("stream", event, payload))
+            task_id = _current_task_id.get()
+            if task_id:
+                payload["task_id"] = task_id
+            self._stream_events.publish(AgentEvent("stream", event, payload))
 
     async def _call_llm_streaming(
         self,
@@ -113,10 +146,20 @@ class AgentLoop:
     ) -> LLMResponse:
         """Call the LLM with streaming, emitting stream events as chunks arrive.
 
-        Returns the final assembled LLMResponse (same shape as non-streaming).
+        Falls back to a plain chat call when nobody is listening for stream
+        events. Returns the final assembled LLMResponse (same shape as non-streaming).
         """
-        msg_id = uuid.uuid4().hex[:12]
-        await self._emit_stream("stream_start", {"id": msg_id})
+        if not self.event_bus or not self.event_bus.has_stream_subscribers():
+            return await self.provider.chat(
+                messages=messages,
+                tools=tool_defs,
+                model=model,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+            )
+
+        msg_id = f"{_MSG_ID_PREFIX}{_next_msg_seq():x}"
+        self._emit_stream("stream_start", {"id": msg_id})
 
         content_parts: list[str] = []
         tool_calls = None
@@ -131,7 +174,7 @@ class AgentLoop:
         ):
             if chunk.delta_content:
                 content_parts.append(chunk.delta_content)
-                await self._emit_stream("stream_chunk", {
+                self._emit_stream("stream_chunk", {
                     "id": msg_id, "delta": chunk.delta_content,
                 })
             if chunk.tool_calls is not None:
@@ -139,10 +182,17 @@ class AgentLoop:
             if chunk.finish_reason:
                 finish_reason = chunk.finish_reason
 
-        await self._emit_stream("stream_end", {"id": msg_id})
+        self._emit_stream("stream_end", {"id": msg_id})
+
+        if not content_parts:
+            content = None
+        elif len(content_parts) == 1:
+            content = content_parts[0]  # no copy for single-chunk replies
+        else:
+            content = "".join(content_parts)
 
         return LLMResponse(
-            content="".join(content_parts) if content_parts else None,
+            content=content,
             tool_calls=tool_calls or [],
             finish_reason=finish_reason,
         )
@@ -180,45 +230,76 @@ class AgentLoop:
             self.tools.register(CronTool(self.cron_service))
 
     async def run(self) -> None:
-        """Run the agent loop, processing messages from the bus."""
-        self._running = True
-        logger.info("Agent loop started")
+        """Run the agent loop, processing messages from the bus.
 
+        Up to ``concurrency`` messages are handled at once; messages for the
+        same session are still processed one after another.
+        """
+        self._running = True
+        self._stop_event.clear()
+        logger.info(f"Agent loop started ({self.concurrency} workers)")
+
+        stop_task = asyncio.create_task(self._stop_event.wait())
+        workers = [
+            asyncio.create_task(self._worker(stop_task))
+            for _ in range(self.concurrency)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            stop_task.cancel()
+
+    async def _worker(self, stop_task: asyncio.Task) -> None:
+        """Consume and process inbound messages until the loop is stopped."""
         while self._running:
-            try:
-                # Wait for next message
-                msg = await asyncio.wait_for(
-                    self.bus.consume_inbound(),
-                    timeout=1.0
-                )
+            # Wait for next message (or shutdown)
+            consume_task = asyncio.create_task(self.bus.consume_inbound())
+            done, _ = await asyncio.wait(
+                {consume_task, stop_task}, return_when=asyncio.FIRST_COMPLETED,
+            )
+            if consume_task not in done:
+                consume_task.cancel()
+                break
+            msg = consume_task.result()
 
-                # Process it
-                try:
-                    response = await self._process_message(msg)
-                    if response:
-                        await self.bus.publish_outbound(response)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    # Send error response
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an error: {str(e)}",
-                        metadata=msg.metadata or {},
-                    ))
-            except asyncio.TimeoutError:
-                continue
+            # Process it
+            try:
+                response = await self._process_message(msg)
+                if response:
+                    await self.bus.publish_outbound(response)
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+                # Send error response
+                await self.bus.publish_outbound(OutboundMessage(
+                    channel=msg.channel,
+                    chat_id=msg.chat_id,
+                    content=f"Sorry, I encountered an error: {str(e)}",
+                    metadata=msg.metadata or {},
+                ))
 
     def stop(self) -> None:
         """Stop the agent loop."""
         self._running = False
+        self._stop_event.set()
+        self.sessions.flush()
         logger.info("Agent loop stopping")
 
+    async def _get_capabilities(self) -> ProviderCapabilities | None:
+        """Return provider capabilities, discovering them at most once until invalidated."""
+        if self._caps is not None:
+            return self._caps
+        async with self._caps_lock:
+            if self._caps is None:
+                self._caps = await self.provider.discover()
+            return self._caps
+
     async def _get_model(self) -> str:
         """Get the effective model name (config override > auto-discovery > provider default)."""
         if self._model_override:
             return self._model_override
-        caps = await self.provider.discover()
+        caps = await self._get_capabilities()
         if caps:
             return caps.model
         return self.provider.get_default_model()
@@ -227,13 +308,13 @@ class AgentLoop:
         """Get the effective context window size (config override > auto-discovery > fallback)."""
         if self.context_window is not None:
             return self.context_window
-        caps = await self.provider.discover()
+        caps = await self._get_capabilities()
         if caps:
             return caps.context_window
         return 8192
 
     async def _prepare_context(
-        self, messages: list[dict[str, Any]], tool_defs: list[dict[str, Any]] | None = None,
+        self, messages: list[dict[str, Any]], tool_tokens: int = 0,
     ) -> tuple[str, list[dict[str, Any]]]:
         """Resolve model, compute budget, and truncate messages.
 
@@ -242,7 +323,6 @@ class AgentLoop:
         model = await self._get_model()
         context_window = await self._get_context_window()
         input_budget = context_window - self.max_tokens
-        tool_tokens = self._estimate_tokens(tool_defs) if tool_defs else 0
         message_budget = input_budget - tool_tokens
         if message_budget <= 0:
             logger.warning(
@@ -253,11 +333,6 @@ class AgentLoop:
         messages = self._truncate_to_budget(messages, message_budget)
         return model, messages
 
-    @staticmethod
-    def _estimate_tokens(messages: list[dict[str, Any]]) -> int:
-        """Estimate token count from messages (~3 chars per token, intentionally conservative)."""
-        return len(json.dumps(messages, ensure_ascii=False)) // 3
-
     @staticmethod
     def _truncate_to_budget(
         messages: list[dict[str, Any]], budget: int
@@ -266,35 +341,134 @@ class AgentLoop:
 
         The first message (system prompt) and last message (current user message)
         are always kept. History messages in between are dropped from oldest first.
+        A MessageBuffer that already fits is returned as-is without a scan.
         """
         if len(messages) <= 2:
             return messages
+        if isinstance(messages, MessageBuffer) and messages.total_chars // 3 <= budget:
+            return messages
 
+        cost = json_char_len
         system = messages[0]
         current = messages[-1]
         history = messages[1:-1]
 
         # Fixed cost: system + current message
-        fixed_tokens = AgentLoop._estimate_tokens([system, current])
-        remaining = budget - fixed_tokens
+        fixed_chars = cost(system) + cost(current)
+        remaining = budget - fixed_chars // 3
         if remaining <= 0:
-            return [system, current]
+            return MessageBuffer([system, current], fixed_chars)
 
         # Keep as many recent history messages as fit
-        kept: list[dict[str, Any]] = []
-        for msg in reversed(history):
-            msg_tokens = AgentLoop._estimate_tokens([msg])
-            if remaining - msg_tokens < 0:
+        start = len(history)
+        kept_chars = fixed_chars
+        for i in range(len(history) - 1, -1, -1):
+            msg_chars = cost(history[i])
+            if remaining - msg_chars // 3 < 0:
                 break
-            kept.append(msg)
-            remaining -= msg_tokens
+            remaining -= msg_chars // 3
+            kept_chars += msg_chars
+            start = i
+
+        if start:
+            logger.info(f"Truncated {start} history messages to fit context window")
+
+        return MessageBuffer([system, *history[start:], current], kept_chars)
+
+    async def _run_iteration_loop(
+        self, messages: list[dict[str, Any]], overflow_message: str,
+    ) -> str | None:
+        """
+        Run the LLM / tool-call loop until the model answers without tool calls.
+
+        Args:
+            messages: Initial messages (system prompt, history, current message).
+            overflow_message: Content to return if the context window overflows.
+
+        Returns:
+            The final response content, or None if max_iterations was reached.
+        """
+        # Resolve model, truncate history to fit context window
+        tool_defs = self.tools.get_definitions()
+        tool_tokens = self.tools.get_definitions_token_estimate()
+        model, messages = await self._prepare_context(MessageBuffer(messages), tool_tokens)
+
+        iteration = 0
+        while iteration < self.max_iterations:
+            iteration += 1
+            self._emit("thinking_started", {"iteration": iteration})
+
+            # Call LLM with streaming (emits stream_start/chunk/end events)
+            response = await self._call_llm_streaming(messages, tool_defs, model)
+
+            # Retry once on context overflow after re-discovery
+            if response.finish_reason == "context_overflow":
+                logger.warning("Context overflow — re-discovering capabilities and retrying")
+                self._caps = None
+                model, messages = await self._prepare_context(messages, tool_tokens)
+                response = await self._call_llm_streaming(messages, tool_defs, model)
+
+            if response.finish_reason == "context_overflow":
+                return overflow_message
 
-        kept.reverse()
-        if len(kept) < len(history):
-            dropped = len(history) - len(kept)
-            logger.info(f"Truncated {dropped} history messages to fit context window")
+            if not response.has_tool_calls:
+                # No tool calls, we're done
+                self._emit("thinking_finished", {"iterations": iteration})
+                return response.content
+
+            # Add assistant message with tool calls
+            # Encode each call's arguments once; reused for history and logging
+            encoded = [
+                (tc, fastjson.dumps(tc.arguments))
+                for tc in response.tool_calls
+            ]
+            tool_call_dicts = [_make_tool_call(tc.id, tc.name, args_str) for tc, args_str in encoded]
+            messages = self.context.add_assistant_message(
+                messages, response.content, tool_call_dicts,
+                reasoning_content=response.reasoning_content,
+            )
 
-        return [system] + kept + [current]
+            # Execute tools
+            for tool_call, args_str in encoded:
+                logger.opt(lazy=True).info(
+                    "Tool call: {}({})", lambda: tool_call.name, lambda: args_str[:200],
+                )
+                self._emit("tool_call", {
+                    "name": tool_call.name,
+                    "args": tool_call.arguments,
+                    "iteration": iteration,
+                })
+                t0 = time.monotonic()
+                result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                duration_ms = int((time.monotonic() - t0) * 1000)
+                self._emit("tool_result", {
+                    "name": tool_call.name,
+                    "result_preview": result[:200] if result else "",
+                    "duration_ms": duration_ms,
+                })
+                messages = self.context.add_tool_result(
+                    messages, tool_call.id, tool_call.name, result
+                )
+
+        self._emit("thinking_finished", {"iterations": iteration})
+        return None
+
+    def _session_lock(self, session_key: str) -> asyncio.Lock:
+        """Return the lock serializing work on a session (kept while in use)."""
+        lock = self._session_locks.get(session_key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_key] = lock
+        return lock
+
+    @staticmethod
+    def _parse_origin(chat_id: str) -> tuple[str, str]:
+        """Split a system message chat_id ("channel:chat_id") into its parts."""
+        if ":" in chat_id:
+            channel, origin_chat_id = chat_id.split(":", 1)
+            return channel, origin_chat_id
+        # Fallback
+        return "cli", chat_id
 
     async def _process_message(self, msg: InboundMessage) -> OutboundMessage | None:
         """
@@ -309,29 +483,31 @@ class AgentLoop:
         # Handle system messages (subagent announces)
         # The chat_id contains the original "channel:chat_id" to route back to
         if msg.channel == "system":
-            return await self._process_system_message(msg)
+            session_key = "{}:{}".format(*self._parse_origin(msg.chat_id))
+            handler = self._process_system_message
+        else:
+            session_key = msg.session_key
+            handler = self._process_user_message
 
         # Track task_id for event tagging (heartbeat / cron tasks)
-        self._current_task_id = msg.metadata.get("task_id") if msg.metadata else None
-
-        preview = msg.content[:80] + "..." if len(msg.content) > 80 else msg.content
-        logger.info(f"Processing message from {msg.channel}:{msg.sender_id}: {preview}")
+        token = _current_task_id.set(msg.metadata.get("task_id") if msg.metadata else None)
+        try:
+            async with self._session_lock(session_key):
+                return await handler(msg)
+        finally:
+            _current_task_id.reset(token)
+
+    async def _process_user_message(self, msg: InboundMessage) -> OutboundMessage:
+        """Process a message from a chat channel, CLI, heartbeat or cron."""
+        # Lazy args: previews are only built if INFO is actually emitted
+        logger.opt(lazy=True).info(
+            "Processing message from {}:{}: {}",
+            lambda: msg.channel, lambda: msg.sender_id, lambda: _preview(msg.content, 80),
+        )
 
         # Get or create session
         session = self.sessions.get_or_create(msg.session_key)
-
-        # Update tool contexts
-        message_tool = self.tools.get("message")
-        if isinstance(message_tool, MessageTool):
-            message_tool.set_context(msg.channel, msg.chat_id)
-
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(msg.channel, msg.chat_id)
-
-        cron_tool = self.tools.get("cron")
-        if isinstance(cron_tool, CronTool):
-            cron_tool.set_context(msg.channel, msg.chat_id)
+        TOOL_CONTEXT.set((msg.channel, msg.chat_id))
 
         # Build initial messages (use get_history for LLM-formatted messages)
         messages = self.context.build_messages(
@@ -353,94 +529,26 @@ class AgentLoop:
                 "instructions and report results when finished."
             )
 
-        # Resolve model, truncate history to fit context window
-        tool_defs = self.tools.get_definitions()
-        model, messages = await self._prepare_context(messages, tool_defs)
-
-        # Agent loop
-        iteration = 0
-        final_content = None
-
-        while iteration < self.max_iterations:
-            iteration += 1
-            await self._emit("thinking_started", {"iteration": iteration})
-
-            # Call LLM with streaming (emits stream_start/chunk/end events)
-            response = await self._call_llm_streaming(messages, tool_defs, model)
-
-            # Retry once on context overflow after re-discovery
-            if response.finish_reason == "context_overflow":
-                logger.warning("Context overflow — re-discovering capabilities and retrying")
-                model, messages = await self._prepare_context(messages, tool_defs)
-                response = await self._call_llm_streaming(messages, tool_defs, model)
-
-            if response.finish_reason == "context_overflow":
-                final_content = "I'm sorry, the message is too long for my context window. Please try a shorter message or start a new session."
-                break
-
-            # Handle tool calls
-            if response.has_tool_calls:
-                # Add assistant message with tool calls
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)  # Must be JSON string
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts,
-                    reasoning_content=response.reasoning_content,
-                )
-
-                # Execute tools
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    await self._emit("tool_call", {
-                        "name": tool_call.name,
-                        "args": tool_call.arguments,
-                        "iteration": iteration,
-                    })
-                    t0 = time.monotonic()
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    duration_ms = int((time.monotonic() - t0) * 1000)
-                    await self._emit("tool_result", {
-                        "name": tool_call.name,
-                        "result_preview": result[:200] if result else "",
-                        "duration_ms": duration_ms,
-                    })
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
-            else:
-                # No tool calls, we're done
-                final_content = response.content
-                await self._emit("thinking_finished", {"iterations": iteration})
-                break
-
+        final_content = await self._run_iteration_loop(
+            messages,
+            overflow_message="I'm sorry, the message is too long for my context window. Please try a shorter message or start a new session.",
+        )
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
-            await self._emit("thinking_finished", {"iterations": iteration})
 
         # Strip <think>...</think> blocks from reasoning models (e.g. Qwen)
-        import re
-        final_content = re.sub(r"<think>[\s\S]*?</think>\s*", "", final_content).strip()
+        final_content = strip_think_tags(final_content)
 
         # Log response preview
-        preview = final_content[:120] + "..." if len(final_content) > 120 else final_content
-        logger.info(f"Response to {msg.channel}:{msg.sender_id}: {preview}")
+        logger.opt(lazy=True).info(
+            "Response to {}:{}: {}",
+            lambda: msg.channel, lambda: msg.sender_id, lambda: _preview(final_content, 120),
+        )
 
         # Save to session
         session.add_message("user", msg.content)
         session.add_message("assistant", final_content)
-        self.sessions.save(session)
-
-        self._current_task_id = None
+        self.sessions.save_later(session)
 
         return OutboundMessage(
             channel=msg.channel,
@@ -459,31 +567,12 @@ class AgentLoop:
         logger.info(f"Processing system message from {msg.sender_id}")
 
         # Parse origin from chat_id (format: "channel:chat_id")
-        if ":" in msg.chat_id:
-            parts = msg.chat_id.split(":", 1)
-            origin_channel = parts[0]
-            origin_chat_id = parts[1]
-        else:
-            # Fallback
-            origin_channel = "cli"
-            origin_chat_id = msg.chat_id
+        origin_channel, origin_chat_id = self._parse_origin(msg.chat_id)
 
         # Use the origin session for context
         session_key = f"{origin_channel}:{origin_chat_id}"
         session = self.sessions.get_or_create(session_key)
-
-        # Update tool contexts
-        message_tool = self.tools.get("message")
-        if isinstance(message_tool, MessageTool):
-            message_tool.set_context(origin_channel, origin_chat_id)
-
-        spawn_tool = self.tools.get("spawn")
-        if isinstance(spawn_tool, SpawnTool):
-            spawn_tool.set_context(origin_channel, origin_chat_id)
-
-        cron_tool = self.tools.get("cron")
-        if isinstance(cron_tool, CronTool):
-            cron_tool.set_context(origin_channel, origin_chat_id)
+        TOOL_CONTEXT.set((origin_channel, origin_chat_id))
 
         # Build messages with the announce content
         messages = self.context.build_messages(
@@ -493,78 +582,17 @@ class AgentLoop:
             chat_id=origin_chat_id,
         )
 
-        # Resolve model, truncate history to fit context window
-        tool_defs = self.tools.get_definitions()
-        model, messages = await self._prepare_context(messages, tool_defs)
-
-        # Agent loop (limited for announce handling)
-        iteration = 0
-        final_content = None
-
-        while iteration < self.max_iterations:
-            iteration += 1
-            await self._emit("thinking_started", {"iteration": iteration})
-
-            response = await self._call_llm_streaming(messages, tool_defs, model)
-
-            if response.finish_reason == "context_overflow":
-                logger.warning("Context overflow — re-discovering capabilities and retrying")
-                model, messages = await self._prepare_context(messages, tool_defs)
-                response = await self._call_llm_streaming(messages, tool_defs, model)
-
-            if response.finish_reason == "context_overflow":
-                final_content = "Background task could not complete — context window exceeded."
-                break
-
-            if response.has_tool_calls:
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)
-                        }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts,
-                    reasoning_content=response.reasoning_content,
-                )
-
-                for tool_call in response.tool_calls:
-                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    await self._emit("tool_call", {
-                        "name": tool_call.name,
-                        "args": tool_call.arguments,
-                        "iteration": iteration,
-                    })
-                    t0 = time.monotonic()
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    duration_ms = int((time.monotonic() - t0) * 1000)
-                    await self._emit("tool_result", {
-                        "name": tool_call.name,
-                        "result_preview": result[:200] if result else "",
-                        "duration_ms": duration_ms,
-                    })
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
-                    )
-            else:
-                final_content = response.content
-                await self._emit("thinking_finished", {"iterations": iteration})
-                break
-
+        final_content = await self._run_iteration_loop(
+            messages,
+            overflow_message="Background task could not complete — context window exceeded.",
+        )
         if final_content is None:
             final_content = "Background task completed."
-            await self._emit("thinking_finished", {"iterations": iteration})
 
         # Save to session (mark as system message in history)
         session.add_message("user", f"[System: {msg.sender_id}] {msg.content}")
         session.add_message("assistant", final_content)
-        self.sessions.save(session)
+        self.sessions.save_later(session)
 
         return OutboundMessage(
             channel=origin_channel,
@@ -100,7 +100,7 @@ class SubagentManager:
         
         logger.info(f"Spawned subagent [{task_id}]: {display_label}")
         if self.event_bus:
-            await self.event_bus.publish(AgentEvent("subagent", "spawned", {
+            self.event_bus.publish(AgentEvent("subagent", "spawned", {
                 "id": task_id, "label": display_label, "task": task[:100],
             }))
         return f"Subagent [{display_label}] started (id: {task_id}). I'll notify you when it completes."
@@ -193,7 +193,7 @@ class SubagentManager:
             
             logger.info(f"Subagent [{task_id}] completed successfully")
             if self.event_bus:
-                await self.event_bus.publish(AgentEvent("subagent", "completed", {
+                self.event_bus.publish(AgentEvent("subagent", "completed", {
                     "id": task_id, "label": label, "success": True,
                     "summary": (final_result or "")[:200],
                 }))
@@ -203,7 +203,7 @@ class SubagentManager:
             error_msg = f"Error: {str(e)}"
             logger.error(f"Subagent [{task_id}] failed: {e}")
             if self.event_bus:
-                await self.event_bus.publish(AgentEvent("subagent", "completed", {
+                self.event_bus.publish(AgentEvent("subagent", "completed", {
                     "id": task_id, "label": label, "success": False,
                     "summary": error_msg[:200],
                 }))
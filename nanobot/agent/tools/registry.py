@@ -1,8 +1,14 @@
 """Tool registry for dynamic tool management."""
 
+from contextvars import ContextVar
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
+from nanobot.utils.helpers import json_char_len
+
+# (channel, chat_id) of the conversation being processed. Set once per message
+# by the agent loop; routing-aware tools read it instead of holding mutable state.
+TOOL_CONTEXT: ContextVar[tuple[str, str]] = ContextVar("tool_context")
 
 
 class ToolRegistry:
@@ -14,14 +20,23 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: dict[str, Tool] = {}
+        # Schemas only change when the tool set does
+        self._definitions: list[dict[str, Any]] | None = None
+        self._definitions_tokens: int | None = None
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
         self._tools[tool.name] = tool
+        self._invalidate()
     
     def unregister(self, name: str) -> None:
         """Unregister a tool by name."""
         self._tools.pop(name, None)
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._definitions = None
+        self._definitions_tokens = None
     
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
@@ -32,8 +47,16 @@ class ToolRegistry:
         return name in self._tools
     
     def get_definitions(self) -> list[dict[str, Any]]:
-        """Get all tool definitions in OpenAI format."""
-        return [tool.to_schema() for tool in self._tools.values()]
+        """Get all tool definitions in OpenAI format (cached until tools change)."""
+        if self._definitions is None:
+            self._definitions = [tool.to_schema() for tool in self._tools.values()]
+        return self._definitions
+
+    def get_definitions_token_estimate(self) -> int:
+        """Estimated prompt tokens taken up by the tool definitions (~3 chars per token)."""
+        if self._definitions_tokens is None:
+            self._definitions_tokens = json_char_len(self.get_definitions()) // 3
+        return self._definitions_tokens
     
     async def execute(self, name: str, params: dict[str, Any]) -> str:
         """
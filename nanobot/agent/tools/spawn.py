@@ -3,6 +3,7 @@
 from typing import Any, TYPE_CHECKING
 
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import TOOL_CONTEXT
 
 if TYPE_CHECKING:
     from nanobot.agent.subagent import SubagentManager
@@ -18,13 +19,6 @@ class SpawnTool(Tool):
     
     def __init__(self, manager: "SubagentManager"):
         self._manager = manager
-        self._origin_channel = "cli"
-        self._origin_chat_id = "direct"
-    
-    def set_context(self, channel: str, chat_id: str) -> None:
-        """Set the origin context for subagent announcements."""
-        self._origin_channel = channel
-        self._origin_chat_id = chat_id
     
     @property
     def name(self) -> str:
@@ -57,9 +51,10 @@ class SpawnTool(Tool):
     
     async def execute(self, task: str, label: str | None = None, **kwargs: Any) -> str:
         """Spawn a subagent to execute the given task."""
+        origin_channel, origin_chat_id = TOOL_CONTEXT.get(("cli", "direct"))
         return await self._manager.spawn(
             task=task,
             label=label,
-            origin_channel=self._origin_channel,
-            origin_chat_id=self._origin_chat_id,
+            origin_channel=origin_channel,
+            origin_chat_id=origin_chat_id,
         )
@@ -3,7 +3,7 @@
 import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Awaitable, Callable
+from typing import Any, Awaitable, Callable, Iterable
 
 from loguru import logger
 
@@ -22,23 +22,149 @@ class EventBus:
     """
     Fire-and-forget pub/sub for AgentEvents.
 
-    No persistence, no queuing.  Subscribers receive events as they happen;
-    missed events on reconnect are acceptable.
+    No persistence.  publish() only enqueues the event; a background task
+    delivers events to subscribers in order, so publishers never wait on
+    observers.  If subscribers fall more than ``max_pending`` events behind,
+    new events are dropped; missed events on reconnect are acceptable.
+
+    Subscribers may restrict themselves to some categories; publishers can ask
+    ``has_stream_subscribers()`` to skip producing stream events nobody reads.
     """
 
-    def __init__(self) -> None:
-        self._subscribers: list[Callable[[AgentEvent], Awaitable[None]]] = []
+    def __init__(self, max_pending: int = 256) -> None:
+        # callback -> categories (None = all). Keyed by the callback itself
+        # rather than id(): bound methods are recreated on every attribute
+        # access but compare equal, so unsubscribe(self.method) works.
+        self._subscribers: dict[
+            Callable[[AgentEvent], Awaitable[None]], frozenset[str] | None
+        ] = {}
+        self._has_stream_subscribers = False
+        self._max_pending = max_pending
+        self._queue: asyncio.Queue[AgentEvent] | None = None
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._dropped = 0
+
+    def publish(self, event: AgentEvent) -> None:
+        """Queue an event for delivery without waiting for subscribers."""
+        if not self._subscribers:
+            return
+        if self._dispatcher is None or self._dispatcher.done():
+            self._queue = asyncio.Queue(maxsize=self._max_pending)
+            self._dispatcher = asyncio.create_task(self._run())
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            if self._dropped == 1 or self._dropped % 100 == 0:
+                logger.warning(f"EventBus backlog full, dropped {self._dropped} events so far")
+
+    async def drain(self) -> None:
+        """Wait until every queued event has been delivered."""
+        if self._queue is not None and self._dispatcher and not self._dispatcher.done():
+            await self._queue.join()
 
-    async def publish(self, event: AgentEvent) -> None:
-        """Publish an event to all subscribers (fire-and-forget)."""
-        for cb in self._subscribers:
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            event = await queue.get()
             try:
-                await cb(event)
-            except Exception as e:
-                logger.warning(f"EventBus subscriber error: {e}")
+                await self._dispatch(event)
+            finally:
+                queue.task_done()
+
+    async def _dispatch(self, event: AgentEvent) -> None:
+        """Deliver one event to all interested subscribers concurrently."""
+        # Snapshot taken before any await, so (un)subscribing mid-dispatch is safe
+        subs = [
+            cb for cb, categories in self._subscribers.items()
+            if categories is None or event.category in categories
+        ]
+        if not subs:
+            return
+        if len(subs) == 1:
+            await self._safe_call(subs[0], event)
+            return
+        async with asyncio.TaskGroup() as tg:
+            for cb in subs:
+                tg.create_task(self._safe_call(cb, event))
+
+    @staticmethod
+    async def _safe_call(cb: Callable[[AgentEvent], Awaitable[None]], event: AgentEvent) -> None:
+        try:
+            await cb(event)
+        except Exception as e:
+            logger.warning(f"EventBus subscriber error: {e}")
 
-    def subscribe(self, callback: Callable[[AgentEvent], Awaitable[None]]) -> None:
-        self._subscribers.append(callback)
+    def subscribe(
+        self,
+        callback: Callable[[AgentEvent], Awaitable[None]],
+        categories: Iterable[str] | None = None,
+    ) -> None:
+        """Subscribe to all events, or only to the given categories."""
+        self._subscribers[callback] = frozenset(categories) if categories is not None else None
+        self._update_stream_flag()
 
     def unsubscribe(self, callback: Callable[[AgentEvent], Awaitable[None]]) -> None:
-        self._subscribers = [cb for cb in self._subscribers if cb is not callback]
+        self._subscribers.pop(callback, None)
+        self._update_stream_flag()
+
+    def has_stream_subscribers(self) -> bool:
+        """Whether any subscriber receives "stream" events."""
+        return self._has_stream_subscribers
+
+    def _update_stream_flag(self) -> None:
+        self._has_stream_subscribers = any(
+            categories is None or "stream" in categories
+            for categories in self._subscribers.values()
+        )
+
+
+class StreamEventBatcher:
+    """
+    Coalesces ``stream_chunk`` events before they reach an EventBus.
+
+    Chunks for the same stream id are concatenated and published as one event
+    ``max_queue_time`` seconds after the first pending chunk, or as soon as
+    ``max_batch_size`` chunks are pending.  Any other event for a stream
+    (e.g. ``stream_end``) flushes that stream first, so ordering is preserved.
+    """
+
+    def __init__(
+        self, bus: EventBus, max_batch_size: int = 64, max_queue_time: float = 0.01,
+    ) -> None:
+        self._bus = bus
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self._pending: dict[str, tuple[dict[str, Any], list[str]]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+
+    def publish(self, event: AgentEvent) -> None:
+        """Publish an event, batching stream chunks."""
+        stream_id = event.data.get("id", "")
+        if event.event != "stream_chunk":
+            self._flush_stream(stream_id)
+            self._bus.publish(event)
+            return
+
+        entry = self._pending.get(stream_id)
+        if entry is None:
+            entry = self._pending[stream_id] = (event.data, [])
+        entry[1].append(event.data.get("delta", ""))
+        if len(entry[1]) >= self.max_batch_size:
+            self._flush_stream(stream_id)
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_queue_time, self.flush)
+
+    def flush(self) -> None:
+        """Publish all pending chunks now."""
+        for stream_id in list(self._pending):
+            self._flush_stream(stream_id)
+
+    def _flush_stream(self, stream_id: str) -> None:
+        entry = self._pending.pop(stream_id, None)
+        if entry is not None:
+            data, parts = entry
+            self._bus.publish(AgentEvent("stream", "stream_chunk", {**data, "delta": "".join(parts)}))
+        if not self._pending and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -3,34 +3,208 @@
 from __future__ import annotations
 
 import asyncio
+import html
 import ipaddress
 import json
+import os
+import re
+import socket
 import time
-import uuid
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
-import httpx
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import ApiConfig
+from nanobot.utils import fastjson
 
 if TYPE_CHECKING:
+    import httpx
+
     from nanobot.bus.event_bus import AgentEvent, EventBus
     from nanobot.session.manager import SessionManager
     from nanobot.task.store import TaskStore
 
 FIXED_CHAT_ID = "default"
 
-# Link preview cache: url -> (result_dict, timestamp)
-_link_preview_cache: dict[str, tuple[dict[str, Any], float]] = {}
+# Link preview LRU cache: url -> (result_dict, expires_at), least recently used first
+_link_preview_cache: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+# Fetches in progress, shared by concurrent requests for the same URL
+_link_preview_inflight: dict[str, asyncio.Task[dict[str, Any]]] = {}
 _LINK_PREVIEW_TTL = 600  # 10 minutes
+_LINK_PREVIEW_ERROR_TTL = 60  # failed fetches are retried sooner
 _LINK_PREVIEW_MAX = 200  # max cached entries
+_LINK_PREVIEW_MAX_BYTES = 256 * 1024  # only this much of a page is parsed
+_SUBSCRIPTIONS_SAVE_DELAY = 0.5  # coalesce subscription changes into one write
+_PUSH_MAX_WORKERS = 16  # parallel web push requests
+_OUTBOX_SIZE = 256  # queued frames per client before it is dropped as too slow
+_WS_MAX_SIZE = 1 << 20  # largest incoming frame; client messages are chat text
+_WS_MAX_QUEUE = 16  # incoming frames buffered per connection
+_RESPONSE_PREFIX = '{"type":"response","content":'
+_ERR_INVALID_JSON = fastjson.dumps({"type": "error", "content": "Invalid JSON"})
+_ERR_UNKNOWN_TYPE_PREFIX = '{"type":"error","content":"Unknown type: '
+_MAX_ECHOED_TYPE = 64  # don't reflect arbitrarily large client input
+
+# Hostname -> (resolves only to public addresses, expires_at)
+_host_safety_cache: OrderedDict[str, tuple[bool, float]] = OrderedDict()
+_HOST_SAFETY_TTL = 60
+_HOST_SAFETY_MAX = 256
+
+
+def _is_public_address(address: str) -> bool:
+    addr = ipaddress.ip_address(address.split("%", 1)[0])  # drop IPv6 scope id
+    return not (addr.is_private or addr.is_loopback or addr.is_link_local or addr.is_reserved)
+
+
+async def _is_public_host(hostname: str) -> bool:
+    """Whether hostname (an IP literal or DNS name) only reaches public addresses.
+
+    DNS answers are cached briefly so repeated previews of the same site
+    don't pay for a lookup each time.
+    """
+    try:
+        return _is_public_address(hostname)
+    except ValueError:
+        pass  # domain name, not IP — resolve it
+
+    now = time.monotonic()
+    cached = _host_safety_cache.get(hostname)
+    if cached and now < cached[1]:
+        return cached[0]
+
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            hostname, None, type=socket.SOCK_STREAM,
+        )
+        safe = bool(infos) and all(_is_public_address(info[4][0]) for info in infos)
+    except (OSError, ValueError):
+        safe = False
+
+    _host_safety_cache[hostname] = (safe, now + _HOST_SAFETY_TTL)
+    _host_safety_cache.move_to_end(hostname)
+    if len(_host_safety_cache) > _HOST_SAFETY_MAX:
+        _host_safety_cache.popitem(last=False)
+    return safe
+
+# Open Graph meta property -> preview field (bytes keys for the raw head scan)
+_OG_FIELDS = {"og:title": "title", "og:description": "description", "og:image": "image"}
+_OG_FIELDS_RAW = {prop.encode(): key for prop, key in _OG_FIELDS.items()}
+
+_HEAD_END_RE = re.compile(rb"</head\s*>", re.I)
+_HEAD_TAG_RE = re.compile(rb"<(meta|link)\b([^>]*)>|<title\b[^>]*>([^<]*)</title\s*>", re.I)
+_ATTR_RE = re.compile(rb"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+
+
+def _scan_link_preview_head(raw: bytes, encoding: str, url: str) -> dict[str, str] | None:
+    """Extract preview fields by scanning the raw <head> with regexes.
+
+    Much cheaper than building a DOM. Returns None when no </head> or title
+    is found, so the caller can fall back to _parse_link_preview().
+    """
+    head_end = _HEAD_END_RE.search(raw, 0, _LINK_PREVIEW_MAX_BYTES)
+    if not head_end:
+        return None
+
+    def text(value: bytes) -> str:
+        return html.unescape(value.decode(encoding, "replace")).strip()
+
+    result: dict[str, str] = {}
+    title = description = icon_href = None
+    for m in _HEAD_TAG_RE.finditer(raw, 0, head_end.start()):
+        if m[1] is None:
+            if title is None:
+                title = text(m[3]) or None
+            continue
+        attrs = {k.lower(): a or b or c for k, a, b, c in _ATTR_RE.findall(m[2])}
+        if m[1].lower() == b"meta":
+            content = attrs.get(b"content")
+            if not content:
+                continue
+            key = _OG_FIELDS_RAW.get(attrs.get(b"property", b"").lower())
+            if key:
+                result.setdefault(key, text(content))
+            elif description is None and attrs.get(b"name", b"").lower() == b"description":
+                description = text(content)
+        elif icon_href is None and attrs.get(b"href") and b"icon" in attrs.get(b"rel", b"").lower():
+            icon_href = text(attrs[b"href"])
+
+    if "title" not in result and title is None:
+        return None
+    return _finish_link_preview(result, title, description, icon_href, url)
+
+
+def _parse_link_preview(page: str, url: str) -> dict[str, str]:
+    """Extract title, description, image and favicon from an HTML page.
+
+    Walks the relevant tags once instead of searching the tree per field.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer  # only needed when the head scan fails
+
+    # Build only the tags we read (the icon <link> included), not the whole DOM
+    soup = BeautifulSoup(page, "lxml", parse_only=SoupStrainer(["meta", "title", "link"]))
+    result: dict[str, str] = {}
+    title = description = icon_href = None
+
+    for tag in soup.find_all(["meta", "title", "link"]):
+        if tag.name == "meta":
+            content = tag.get("content")
+            if not content:
+                continue
+            key = _OG_FIELDS.get(tag.get("property"))
+            # Open Graph tags win over the <title> / meta description fallbacks
+            if key:
+                result.setdefault(key, content)
+            elif description is None and tag.get("name") == "description":
+                description = content
+        elif tag.name == "title":
+            if title is None and tag.string:
+                title = tag.string.strip()
+        elif icon_href is None and tag.get("href"):
+            rel = tag.get("rel") or []
+            if any("icon" in v for v in rel):
+                icon_href = tag["href"]
+
+    return _finish_link_preview(result, title, description, icon_href, url)
+
+
+def _finish_link_preview(
+    result: dict[str, str], title: str | None, description: str | None,
+    icon_href: str | None, url: str,
+) -> dict[str, str]:
+    """Apply the <title> / description fallbacks and resolve the favicon URL."""
+    if "title" not in result and title:
+        result["title"] = title
+    if "description" not in result and description:
+        result["description"] = description
+
+    # Favicon
+    parsed = urlparse(url)
+    if icon_href:
+        if icon_href.startswith("//"):
+            icon_href = f"{parsed.scheme}:{icon_href}"
+        elif icon_href.startswith("/"):
+            icon_href = f"{parsed.scheme}://{parsed.netloc}{icon_href}"
+        result["favicon"] = icon_href
+    else:
+        result["favicon"] = f"{parsed.scheme}://{parsed.netloc}/favicon.ico"
+    return result
+
+
+class _Connection:
+    """A connected client: its socket and its queue of outgoing frames."""
+
+    __slots__ = ("ws", "outbox", "__weakref__")
+
+    def __init__(self, ws) -> None:
+        self.ws = ws
+        self.outbox: asyncio.Queue[str] = asyncio.Queue(maxsize=_OUTBOX_SIZE)
 
 
 class ApiChannel(BaseChannel):
@@ -63,8 +237,13 @@ class ApiChannel(BaseChannel):
         self._model_name = model_name
         self._start_time = time.monotonic()
         self._server = None
-        self._connections: dict[str, object] = {}
+        # Live clients. _handler holds the strong reference for the lifetime of
+        # the connection, so entries disappear with it even on abnormal exits.
+        self._connections: weakref.WeakValueDictionary[str, _Connection] = (
+            weakref.WeakValueDictionary()
+        )
         self._latest_conn_id: str | None = None
+        self._preview_client: httpx.AsyncClient | None = None  # created on first preview
 
         # Workspace root for file browser
         self._workspace = Path(workspace).expanduser().resolve()
@@ -72,25 +251,31 @@ class ApiChannel(BaseChannel):
         # Push notifications
         self._push_dir = Path(workspace).expanduser() / "push"
         self._vapid_keys: dict[str, str] | None = None
-        self._push_subscriptions: list[dict[str, Any]] = []
+        self._push_vapid_payload: str | None = None  # encoded push_vapid_key reply
+        self._push_subscriptions: dict[str, dict[str, Any]] = {}  # endpoint -> subscription
+        self._subs_save_task: asyncio.Task[None] | None = None
         self._load_push_state()
 
     def _load_push_state(self) -> None:
         """Load VAPID keys and subscriptions from disk."""
-        vapid_path = self._push_dir / "vapid.json"
-        subs_path = self._push_dir / "subscriptions.json"
+        try:
+            self._vapid_keys = self._read_push_file("vapid.json")
+        except Exception as e:
+            logger.warning(f"Failed to load VAPID keys: {e}")
 
-        if vapid_path.exists():
-            try:
-                self._vapid_keys = json.loads(vapid_path.read_text())
-            except Exception as e:
-                logger.warning(f"Failed to load VAPID keys: {e}")
+        try:
+            subs = self._read_push_file("subscriptions.json") or []
+            self._push_subscriptions = {s.get("endpoint", ""): s for s in subs}
+        except Exception as e:
+            logger.warning(f"Failed to load push subscriptions: {e}")
 
-        if subs_path.exists():
-            try:
-                self._push_subscriptions = json.loads(subs_path.read_text())
-            except Exception as e:
-                logger.warning(f"Failed to load push subscriptions: {e}")
+    def _read_push_file(self, name: str) -> Any:
+        """Parse a JSON file from the push directory; None if missing or empty."""
+        try:
+            raw = (self._push_dir / name).read_bytes()
+        except FileNotFoundError:
+            return None
+        return fastjson.loads(raw) if raw.strip() else None
 
     def _ensure_vapid_keys(self) -> dict[str, str]:
         """Generate or return existing VAPID key pair."""
@@ -120,26 +305,44 @@ class ApiChannel(BaseChannel):
         return self._vapid_keys
 
     def _save_subscriptions(self) -> None:
-        """Persist push subscriptions to disk."""
+        """Schedule a debounced write of push subscriptions to disk."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:  # no event loop (e.g. scripts): write right away
+            self._write_subscriptions(list(self._push_subscriptions.values()))
+            return
+        if self._subs_save_task is None or self._subs_save_task.done():
+            self._subs_save_task = asyncio.create_task(self._save_subscriptions_later())
+
+    async def _save_subscriptions_later(self) -> None:
+        await asyncio.sleep(_SUBSCRIPTIONS_SAVE_DELAY)
+        await self._flush_subscriptions()
+
+    async def _flush_subscriptions(self) -> None:
+        subs = list(self._push_subscriptions.values())
+        try:
+            await asyncio.to_thread(self._write_subscriptions, subs)
+        except Exception as e:
+            logger.warning(f"Failed to save push subscriptions: {e}")
+
+    def _write_subscriptions(self, subs: list[dict[str, Any]]) -> None:
+        """Atomically replace subscriptions.json (write temp file, then rename)."""
         self._push_dir.mkdir(parents=True, exist_ok=True)
         subs_path = self._push_dir / "subscriptions.json"
-        subs_path.write_text(json.dumps(self._push_subscriptions, indent=2))
+        tmp_path = subs_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(subs, indent=2))
+        os.replace(tmp_path, subs_path)
 
     def _add_subscription(self, subscription: dict[str, Any]) -> None:
         """Add a push subscription (dedup by endpoint)."""
         endpoint = subscription.get("endpoint", "")
-        self._push_subscriptions = [
-            s for s in self._push_subscriptions if s.get("endpoint") != endpoint
-        ]
-        self._push_subscriptions.append(subscription)
+        self._push_subscriptions[endpoint] = subscription
         self._save_subscriptions()
         logger.info(f"Push subscription added: {endpoint[:60]}...")
 
     def _remove_subscription(self, endpoint: str) -> None:
         """Remove a push subscription by endpoint."""
-        self._push_subscriptions = [
-            s for s in self._push_subscriptions if s.get("endpoint") != endpoint
-        ]
+        self._push_subscriptions.pop(endpoint, None)
         self._save_subscriptions()
         logger.info(f"Push subscription removed: {endpoint[:60]}...")
 
@@ -147,27 +350,47 @@ class ApiChannel(BaseChannel):
         """Send a web push notification to all subscribers (runs in thread)."""
         if not self._push_subscriptions or not self._vapid_keys:
             return
-        await asyncio.to_thread(self._send_push_sync, title, body)
+        dead_endpoints = await asyncio.to_thread(self._send_push_sync, title, body)
+
+        # Clean up expired subscriptions (on the loop, which owns the save task)
+        for ep in dead_endpoints:
+            self._remove_subscription(ep)
+
+    def _send_push_sync(self, title: str, body: str) -> list[str]:
+        """Synchronous push sending, intended for asyncio.to_thread.
 
-    def _send_push_sync(self, title: str, body: str) -> None:
-        """Synchronous push sending, intended for asyncio.to_thread."""
+        Returns the endpoints of subscriptions that have expired.
+        """
         try:
             from pywebpush import webpush, WebPushException
         except ImportError:
             logger.debug("pywebpush not available, skipping push")
-            return
+            return []
 
-        data = json.dumps({"title": title, "body": body})
+        data = fastjson.dumps({"title": title, "body": body})
         dead_endpoints: list[str] = []
 
-        for sub in self._push_subscriptions:
-            try:
-                webpush(
+        # Snapshot: runs in a worker thread while the loop may add/remove
+        subs = list(self._push_subscriptions.values())
+        if not subs:
+            return dead_endpoints
+
+        # Each push is an independent HTTPS request, so send them in parallel
+        with ThreadPoolExecutor(max_workers=min(_PUSH_MAX_WORKERS, len(subs))) as pool:
+            futures = [
+                (sub, pool.submit(
+                    webpush,
                     subscription_info=sub,
                     data=data,
                     vapid_private_key=self._vapid_keys["private_key"],
                     vapid_claims={"sub": "mailto:nanobot@localhost"},
-                )
+                ))
+                for sub in subs
+            ]
+
+        for sub, future in futures:
+            try:
+                future.result()
             except WebPushException as e:
                 if "410" in str(e) or "404" in str(e):
                     dead_endpoints.append(sub.get("endpoint", ""))
@@ -176,9 +399,7 @@ class ApiChannel(BaseChannel):
             except Exception as e:
                 logger.debug(f"Push notification error: {e}")
 
-        # Clean up expired subscriptions
-        for ep in dead_endpoints:
-            self._remove_subscription(ep)
+        return dead_endpoints
 
     async def start(self) -> None:
         """Start the WebSocket server."""
@@ -191,7 +412,14 @@ class ApiChannel(BaseChannel):
         if self.event_bus:
             self.event_bus.subscribe(self._on_agent_event)
 
-        self._server = await websockets.serve(self._handler, host, port)
+        self._server = await websockets.serve(
+            self._handler, host, port,
+            max_size=_WS_MAX_SIZE,
+            max_queue=_WS_MAX_QUEUE,
+            compression="deflate" if self.config.compression else None,
+            ping_interval=20,
+            ping_timeout=20,
+        )
         logger.info(f"API channel listening on ws://{host}:{port}")
 
         await self._server.wait_closed()
@@ -206,8 +434,16 @@ class ApiChannel(BaseChannel):
         if not self._connections:
             return
 
+        data = event.data
         # Stream events get their own wire protocol messages
-        if event.category == "stream":
+        if (event.category == "stream" and event.event == "stream_chunk"
+                and "task_id" not in data and "id" in data and "delta" in data):
+            # Hot path: one frame per chunk batch; skip building a dict
+            payload = (
+                f'{{"type":"stream_chunk","id":{fastjson.dumps(data["id"])},'
+                f'"delta":{fastjson.dumps(data["delta"])}}}'
+            )
+        elif event.category == "stream":
             stream_type = event.event
             msg: dict[str, Any] = {"type": stream_type}
             if "id" in event.data:
@@ -217,15 +453,15 @@ class ApiChannel(BaseChannel):
             # Propagate task_id so frontend can filter
             if "task_id" in event.data:
                 msg["task_id"] = event.data["task_id"]
-            payload = json.dumps(msg)
+            payload = fastjson.dumps(msg)
         elif event.category == "task":
-            payload = json.dumps({
+            payload = fastjson.dumps({
                 "type": "task_event",
                 "event": event.event,
                 "data": event.data,
             })
         elif event.category == "system_message":
-            payload = json.dumps({
+            payload = fastjson.dumps({
                 "type": "system_message",
                 "task_id": event.data.get("task_id", ""),
                 "content": event.data.get("content", ""),
@@ -237,14 +473,55 @@ class ApiChannel(BaseChannel):
                 "event": event.event,
                 "data": event.data,
             }
-            payload = json.dumps(wire)
-        dead: list[str] = []
-        for conn_id, ws in list(self._connections.items()):
-            try:
-                await ws.send(payload)
-            except Exception:
-                dead.append(conn_id)
+            payload = fastjson.dumps(wire)
+        # Enqueue only; each client's writer task does the actual send, so a
+        # slow socket never holds up the others (or the event bus)
+        dead = [
+            conn_id for conn_id, conn in self._connections.items()
+            if not self._enqueue(conn.outbox, payload)
+        ]
         for conn_id in dead:
+            self._drop_slow_client(conn_id)
+
+    @staticmethod
+    def _enqueue(outbox: asyncio.Queue[str], payload: str) -> bool:
+        try:
+            outbox.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def _drop_slow_client(self, conn_id: str) -> None:
+        """Disconnect a client whose outbox overflowed; its handler cleans up."""
+        conn = self._connections.pop(conn_id, None)
+        logger.warning(f"API: client {conn_id} is not keeping up, disconnecting")
+        if conn is not None:
+            asyncio.create_task(conn.ws.close())
+
+    async def _write_outbox(self, conn_id: str, conn: _Connection) -> None:
+        """Send queued frames to one client, in order.
+
+        With ``batch_ms`` set, frames queued within that window after the first
+        are sent together as one {"type": "batch", "items": [...]} frame.
+        """
+        batch_window = self.config.batch_ms / 1000
+        ws, outbox = conn.ws, conn.outbox
+        try:
+            while True:
+                payload = await outbox.get()
+                if batch_window > 0:
+                    await asyncio.sleep(batch_window)
+                    if not outbox.empty():
+                        items = [payload]
+                        while not outbox.empty():
+                            items.append(outbox.get_nowait())
+                        # Items are already encoded; splice them in without re-encoding
+                        payload = '{"type":"batch","items":[' + ",".join(items) + "]}"
+                await ws.send(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"API: send to {conn_id} failed: {e}")
             self._connections.pop(conn_id, None)
 
     async def stop(self) -> None:
@@ -262,34 +539,48 @@ class ApiChannel(BaseChannel):
         self._connections.clear()
         self._latest_conn_id = None
 
+        if self._preview_client:
+            await self._preview_client.aclose()
+            self._preview_client = None
+
+        # Write out any pending subscription change now instead of after the delay
+        if self._subs_save_task and not self._subs_save_task.done():
+            self._subs_save_task.cancel()
+            await self._flush_subscriptions()
+
     async def send(self, msg: OutboundMessage) -> None:
         """Send a response to the client via conn_id in metadata."""
         conn_id = msg.metadata.get("_conn_id") if msg.metadata else None
-        ws = self._connections.get(conn_id) if conn_id else None
+        conn = self._connections.get(conn_id) if conn_id else None
 
         # Fallback: send to most recently connected client
-        if not ws and self._latest_conn_id:
-            ws = self._connections.get(self._latest_conn_id)
+        if conn is None and self._latest_conn_id:
+            conn_id = self._latest_conn_id
+            conn = self._connections.get(conn_id)
 
-        if not ws:
+        if conn is None:
             logger.warning(f"API: no connection for conn_id={conn_id}")
             return
 
-        try:
-            payload = json.dumps({"type": "response", "content": msg.content})
-            await ws.send(payload)
-        except Exception as e:
-            logger.error(f"API send error: {e}")
+        # Queued behind any stream events so the response arrives after stream_end
+        payload = _RESPONSE_PREFIX + fastjson.dumps(msg.content) + "}"
+        if not self._enqueue(conn.outbox, payload):
+            self._drop_slow_client(conn_id)
 
     async def _handler(self, ws) -> None:
         """Handle a single WebSocket connection."""
-        conn_id = uuid.uuid4().hex[:8]
-        self._connections[conn_id] = ws
+        conn_id = os.urandom(4).hex()
+        while conn_id in self._connections:  # 32-bit ids: rare, but cheap to rule out
+            conn_id = os.urandom(4).hex()
+        conn = _Connection(ws)
+        self._connections[conn_id] = conn
         self._latest_conn_id = conn_id
         remote = ws.remote_address
         logger.info(f"API: client connected conn={conn_id} from {remote}")
 
+        # Events arriving meanwhile wait in the outbox until history is sent
         await self._send_history(ws)
+        writer = asyncio.create_task(self._write_outbox(conn_id, conn))
 
         try:
             async for raw in ws:
@@ -297,6 +588,7 @@ class ApiChannel(BaseChannel):
         except Exception as e:
             logger.debug(f"API: connection {conn_id} closed: {e}")
         finally:
+            writer.cancel()
             self._connections.pop(conn_id, None)
             if self._latest_conn_id == conn_id:
                 self._latest_conn_id = None
@@ -314,102 +606,90 @@ class ApiChannel(BaseChannel):
             logger.debug(f"API: no history for session {session_key}")
             return
 
-        history = [{"role": m["role"], "content": m["content"]}
-                   for m in session.messages]
-        payload = json.dumps({"type": "history", "messages": history})
+        payload = f'{{"type":"history","messages":{session.history_json()}}}'
         try:
             await ws.send(payload)
-            logger.info(f"API: sent {len(history)} history messages")
+            logger.info(f"API: sent {len(session.messages)} history messages")
         except Exception as e:
             logger.error(f"API: failed to send history: {e}")
 
     @staticmethod
-    def _is_safe_url(url: str) -> bool:
-        """Reject URLs targeting private/reserved IP ranges."""
+    async def _is_safe_url(url: str) -> bool:
+        """Reject URLs whose host is, or resolves to, a private/reserved IP."""
         parsed = urlparse(url)
         if parsed.scheme not in ("http", "https"):
             return False
         hostname = parsed.hostname
         if not hostname:
             return False
-        try:
-            addr = ipaddress.ip_address(hostname)
-            if addr.is_private or addr.is_loopback or addr.is_link_local or addr.is_reserved:
-                return False
-        except ValueError:
-            pass  # domain name, not IP — OK
-        return True
+        return await _is_public_host(hostname)
+
+    @classmethod
+    async def _check_request_url(cls, request: "httpx.Request") -> None:
+        """httpx request hook: re-check every hop, including redirects."""
+        if not await cls._is_safe_url(str(request.url)):
+            raise ValueError(f"Refusing to fetch non-public URL: {request.url}")
 
     async def _fetch_link_preview(self, url: str) -> dict[str, Any]:
-        """Fetch Open Graph metadata for a URL. Results are cached."""
-        if not self._is_safe_url(url):
-            return {"url": url}
+        """Fetch Open Graph metadata for a URL.
 
-        now = time.monotonic()
+        Results (including failures) are cached, and concurrent requests for
+        the same URL share a single fetch.
+        """
         cached = _link_preview_cache.get(url)
-        if cached and (now - cached[1]) < _LINK_PREVIEW_TTL:
-            return cached[0]
+        if cached:
+            if time.monotonic() < cached[1]:
+                _link_preview_cache.move_to_end(url)
+                return cached[0]
+            del _link_preview_cache[url]
+
+        if not await self._is_safe_url(url):
+            return {"url": url}
+
+        task = _link_preview_inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._load_link_preview(url))
+            _link_preview_inflight[url] = task
+            task.add_done_callback(lambda _: _link_preview_inflight.pop(url, None))
+        # Shield so a disconnecting client doesn't cancel the fetch for others
+        return await asyncio.shield(task)
 
+    async def _load_link_preview(self, url: str) -> dict[str, Any]:
+        """Fetch and parse a link preview, then store it in the cache."""
         result: dict[str, Any] = {"url": url}
+        ttl = _LINK_PREVIEW_TTL
         try:
-            async with httpx.AsyncClient(
-                timeout=5, follow_redirects=True,
-                headers={"User-Agent": "NanobotLinkPreview/1.0"},
-            ) as client:
-                resp = await client.get(url)
-                resp.raise_for_status()
-
-            soup = BeautifulSoup(resp.text, "html.parser")
-
-            # Open Graph tags
-            for prop in ("og:title", "og:description", "og:image"):
-                tag = soup.find("meta", attrs={"property": prop})
-                if tag and tag.get("content"):
-                    key = prop.split(":")[1]  # title, description, image
-                    result[key] = tag["content"]
-
-            # Fallback to <title>
-            if "title" not in result:
-                title_tag = soup.find("title")
-                if title_tag and title_tag.string:
-                    result["title"] = title_tag.string.strip()
-
-            # Fallback description from meta name="description"
-            if "description" not in result:
-                desc_tag = soup.find("meta", attrs={"name": "description"})
-                if desc_tag and desc_tag.get("content"):
-                    result["description"] = desc_tag["content"]
-
-            # Favicon
-            parsed = urlparse(url)
-            icon_tag = soup.find("link", rel=lambda v: v and "icon" in v)
-            if icon_tag and icon_tag.get("href"):
-                href = icon_tag["href"]
-                if href.startswith("//"):
-                    href = f"{parsed.scheme}:{href}"
-                elif href.startswith("/"):
-                    href = f"{parsed.scheme}://{parsed.netloc}{href}"
-                result["favicon"] = href
-            else:
-                result["favicon"] = f"{parsed.scheme}://{parsed.netloc}/favicon.ico"
+            if self._preview_client is None:
+                import httpx
+
+                self._preview_client = httpx.AsyncClient(
+                    timeout=5, follow_redirects=True,
+                    headers={"User-Agent": "NanobotLinkPreview/1.0"},
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                    event_hooks={"request": [self._check_request_url]},
+                )
+            resp = await self._preview_client.get(url)
+            resp.raise_for_status()
+
+            # OG tags live in <head>: try a cheap scan of the raw bytes first,
+            # then a bounded full parse for pages the scan can't handle
+            raw = resp.content
+            encoding = resp.encoding or "utf-8"
+            fields = _scan_link_preview_head(raw, encoding, url)
+            if fields is None:
+                page = raw[:_LINK_PREVIEW_MAX_BYTES].decode(encoding, "replace")
+                fields = _parse_link_preview(page, url)
+            result.update(fields)
 
         except Exception as e:
             logger.debug(f"Link preview failed for {url}: {e}")
             # Return whatever we have (at minimum just the url)
+            ttl = _LINK_PREVIEW_ERROR_TTL
 
-        # Evict expired entries if cache is full
-        if len(_link_preview_cache) >= _LINK_PREVIEW_MAX:
-            expired = [k for k, (_, ts) in _link_preview_cache.items()
-                       if (now - ts) >= _LINK_PREVIEW_TTL]
-            for k in expired:
-                del _link_preview_cache[k]
-            # If still full, drop oldest half
-            if len(_link_preview_cache) >= _LINK_PREVIEW_MAX:
-                sorted_keys = sorted(_link_preview_cache, key=lambda k: _link_preview_cache[k][1])
-                for k in sorted_keys[:len(sorted_keys) // 2]:
-                    del _link_preview_cache[k]
-
-        _link_preview_cache[url] = (result, now)
+        _link_preview_cache[url] = (result, time.monotonic() + ttl)
+        _link_preview_cache.move_to_end(url)
+        if len(_link_preview_cache) > _LINK_PREVIEW_MAX:
+            _link_preview_cache.popitem(last=False)
         return result
 
     def _resolve_workspace_path(self, rel_path: str) -> Path:
@@ -427,9 +707,9 @@ class ApiChannel(BaseChannel):
     async def _process_message(self, ws, conn_id: str, raw: str) -> None:
         """Parse and route a single inbound message."""
         try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
-            await ws.send(json.dumps({"type": "error", "content": "Invalid JSON"}))
+            data = fastjson.loads(raw)
+        except ValueError:
+            await ws.send(_ERR_INVALID_JSON)
             return
 
         msg_type = data.get("type")
@@ -445,14 +725,14 @@ class ApiChannel(BaseChannel):
                 "gateway_url": f"ws://{self.config.host}:{self.config.port}",
                 "capabilities": ["chat", "workspace", "tasks"],
             }
-            await ws.send(json.dumps(payload))
+            await ws.send(fastjson.dumps(payload))
             return
 
         if msg_type == "link_preview":
             url = data.get("url", "")
             if url:
                 result = await self._fetch_link_preview(url)
-                payload = json.dumps({"type": "link_preview_result", **result})
+                payload = fastjson.dumps({"type": "link_preview_result", **result})
                 try:
                     await ws.send(payload)
                 except Exception as e:
@@ -460,9 +740,12 @@ class ApiChannel(BaseChannel):
             return
 
         if msg_type == "push_vapid":
-            keys = self._ensure_vapid_keys()
-            payload = json.dumps({"type": "push_vapid_key", "key": keys["public_key"]})
-            await ws.send(payload)
+            if self._push_vapid_payload is None:
+                keys = self._ensure_vapid_keys()
+                self._push_vapid_payload = fastjson.dumps(
+                    {"type": "push_vapid_key", "key": keys["public_key"]}
+                )
+            await ws.send(self._push_vapid_payload)
             return
 
         if msg_type == "push_subscribe":
@@ -488,21 +771,21 @@ class ApiChannel(BaseChannel):
                         "completedAtMs": t.completed_at_ms,
                         "error": t.error,
                     })
-            await ws.send(json.dumps({"type": "task_list_result", "tasks": tasks}))
+            await ws.send(fastjson.dumps({"type": "task_list_result", "tasks": tasks}))
             return
 
         if msg_type == "task_session":
             task_id = data.get("task_id", "")
-            messages: list[dict[str, str]] = []
+            messages = "[]"
             if self.task_store and self.session_manager:
                 task = self.task_store.get(task_id)
                 if task:
                     session = self.session_manager.get_or_create(task.session_key)
-                    messages = [{"role": m["role"], "content": m["content"]}
-                                for m in session.messages]
-            await ws.send(json.dumps({
-                "type": "task_session_result", "task_id": task_id, "messages": messages,
-            }))
+                    messages = session.history_json()
+            await ws.send(
+                f'{{"type":"task_session_result","task_id":{fastjson.dumps(task_id)},'
+                f'"messages":{messages}}}'
+            )
             return
 
         if msg_type == "workspace_list":
@@ -522,7 +805,7 @@ class ApiChannel(BaseChannel):
             except Exception as e:
                 payload = {"type": "workspace_list_result", "path": data.get("path", ""),
                            "entries": [], "error": str(e)}
-            await ws.send(json.dumps(payload))
+            await ws.send(fastjson.dumps(payload))
             return
 
         if msg_type == "workspace_read":
@@ -536,7 +819,7 @@ class ApiChannel(BaseChannel):
             except Exception as e:
                 payload = {"type": "workspace_read_result",
                            "path": data.get("path", ""), "content": "", "error": str(e)}
-            await ws.send(json.dumps(payload))
+            await ws.send(fastjson.dumps(payload))
             return
 
         if msg_type == "workspace_write":
@@ -549,11 +832,13 @@ class ApiChannel(BaseChannel):
             except Exception as e:
                 payload = {"type": "workspace_write_result",
                            "path": data.get("path", ""), "success": False, "error": str(e)}
-            await ws.send(json.dumps(payload))
+            await ws.send(fastjson.dumps(payload))
             return
 
         if msg_type != "message":
-            await ws.send(json.dumps({"type": "error", "content": f"Unknown type: {msg_type}"}))
+            # Escape the (client-supplied) type via the encoder, minus its quotes
+            echoed = fastjson.dumps(str(msg_type)[:_MAX_ECHOED_TYPE])[1:-1]
+            await ws.send(f'{_ERR_UNKNOWN_TYPE_PREFIX}{echoed}"}}')
             return
 
         content = data.get("content", "")
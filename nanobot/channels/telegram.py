@@ -242,7 +242,7 @@ class TelegramChannel(BaseChannel):
         session = self.session_manager.get_or_create(session_key)
         msg_count = len(session.messages)
         session.clear()
-        self.session_manager.save(session)
+        self.session_manager.save_later(session)
         
         logger.info(f"Session reset for {session_key} (cleared {msg_count} messages)")
         await update.message.reply_text("🔄 Conversation history cleared. Let's start fresh!")
@@ -2,23 +2,21 @@
 
 import asyncio
 import os
+import re
 import signal
 from pathlib import Path
-import select
 import sys
+from typing import TYPE_CHECKING, Callable
 
 import typer
 from rich.console import Console
-from rich.markdown import Markdown
-from rich.table import Table
-from rich.text import Text
-
-from prompt_toolkit import PromptSession
-from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.patch_stdout import patch_stdout
+from rich.text import Text  # already loaded by rich.console
 
 from nanobot import __version__, __logo__
+from nanobot.utils.helpers import strip_think_tags
+
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
 
 app = typer.Typer(
     name="nanobot",
@@ -28,12 +26,18 @@ app = typer.Typer(
 
 console = Console()
 EXIT_COMMANDS = {"exit", "quit", "/exit", "/quit", ":q"}
+_RESPONSE_HEADER = Text(f"{__logo__} nanobot", style="cyan")
+# Heuristic for replies that may contain Markdown syntax: newlines, inline
+# markup, list markers ("- ", "+ ", "1. ", "1) "), entities, backslash escapes
+# and indented code. Replies it doesn't match are printed as plain text
+# without going through the Markdown parser.
+_MARKDOWN_HINT = re.compile(r"[\n`*_#\[\]<>|~+&\\-]|\d[.)]|^(?: {4}|\t)")
 
 # ---------------------------------------------------------------------------
 # CLI input: prompt_toolkit for editing, paste, history, and display
 # ---------------------------------------------------------------------------
 
-_PROMPT_SESSION: PromptSession | None = None
+_PROMPT_SESSION: "PromptSession | None" = None
 _SAVED_TERM_ATTRS = None  # original termios settings, restored on exit
 
 
@@ -49,20 +53,9 @@ def _flush_pending_tty_input() -> None:
     try:
         import termios
         termios.tcflush(fd, termios.TCIFLUSH)
-        return
     except Exception:
         pass
 
-    try:
-        while True:
-            ready, _, _ = select.select([fd], [], [], 0)
-            if not ready:
-                break
-            if not os.read(fd, 4096):
-                break
-    except Exception:
-        return
-
 
 def _restore_terminal() -> None:
     """Restore terminal to its original state (echo, line buffering, etc.)."""
@@ -77,6 +70,9 @@ def _restore_terminal() -> None:
 
 def _init_prompt_session() -> None:
     """Create the prompt_toolkit session with persistent file history."""
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import FileHistory
+
     global _PROMPT_SESSION, _SAVED_TERM_ATTRS
 
     # Save terminal state so we can restore it on exit
@@ -99,9 +95,13 @@ def _init_prompt_session() -> None:
 def _print_agent_response(response: str, render_markdown: bool) -> None:
     """Render assistant response with consistent terminal styling."""
     content = response or ""
-    body = Markdown(content) if render_markdown else Text(content)
+    if render_markdown and _MARKDOWN_HINT.search(content):
+        from rich.markdown import Markdown
+        body = Markdown(content)
+    else:
+        body = Text(content)
     console.print()
-    console.print(f"[cyan]{__logo__} nanobot[/cyan]")
+    console.print(_RESPONSE_HEADER)
     console.print(body)
     console.print()
 
@@ -119,6 +119,9 @@ async def _read_interactive_input_async() -> str:
     - History navigation (up/down arrows)
     - Clean display (no ghost characters or artifacts)
     """
+    from prompt_toolkit.formatted_text import HTML
+    from prompt_toolkit.patch_stdout import patch_stdout
+
     if _PROMPT_SESSION is None:
         raise RuntimeError("Call _init_prompt_session() first")
     try:
@@ -268,17 +271,38 @@ def _make_provider(config):
     """Create LiteLLMProvider from config. Exits if no API key found."""
     from nanobot.providers.litellm_provider import LiteLLMProvider
     model = config.agents.defaults.model
-    p = config.get_provider(model or None)
+    p, provider_name, api_base = config.resolve_provider(model or None)
     if not (p and p.api_key) and not model.startswith("bedrock/"):
         console.print("[red]Error: No API key configured.[/red]")
         console.print("Set one in ~/.nanobot/config.json under providers section")
         raise typer.Exit(1)
     return LiteLLMProvider(
         api_key=p.api_key if p else None,
-        api_base=config.get_api_base(model or None),
+        api_base=api_base,
         default_model=model or "auto",
         extra_headers=p.extra_headers if p else None,
-        provider_name=config.get_provider_name(model or None),
+        provider_name=provider_name,
+    )
+
+
+def _make_agent(config, bus, provider, **kwargs):
+    """Create an AgentLoop wired from config; kwargs add optional services."""
+    from nanobot.agent.loop import AgentLoop
+    defaults = config.agents.defaults
+    return AgentLoop(
+        bus=bus,
+        provider=provider,
+        workspace=config.workspace_path,
+        model=defaults.model or None,
+        max_iterations=defaults.max_tool_iterations,
+        web_search_config=config.tools.web.search,
+        exec_config=config.tools.exec,
+        restrict_to_workspace=config.tools.restrict_to_workspace,
+        max_tokens=defaults.max_tokens,
+        temperature=defaults.temperature,
+        context_window=defaults.context_window,
+        concurrency=defaults.max_concurrent_messages,
+        **kwargs,
     )
 
 
@@ -287,10 +311,15 @@ def _make_provider(config):
 # ============================================================================
 
 
-def _strip_think_tags(text: str) -> str:
-    """Strip <think>...</think> blocks from model output."""
-    import re
-    return re.sub(r"<think>[\s\S]*?</think>\s*", "", text).strip()
+def _inject_system_message(session_manager, event_bus, task_id: str, content: str) -> None:
+    """Append a [System] note to the web chat session and announce it to clients."""
+    from nanobot.bus.event_bus import AgentEvent
+    chat_session = session_manager.get_or_create("api:default")
+    chat_session.add_message("assistant", content)
+    session_manager.save_later(chat_session)
+    event_bus.publish(AgentEvent("system_message", "injected", {
+        "task_id": task_id, "content": content,
+    }))
 
 
 def _make_heartbeat_callback(config, agent, task_store, session_manager, event_bus):
@@ -304,18 +333,13 @@ def _make_heartbeat_callback(config, agent, task_store, session_manager, event_b
         task = task_store.add("heartbeat", "Heartbeat check", "")
         session_key = f"heartbeat:{task.id}"
         task.session_key = session_key
-        task_store._save()
-        await event_bus.publish(AgentEvent("task", "started", {
+        task_store.save()
+        event_bus.publish(AgentEvent("task", "started", {
             "task_id": task.id, "type": "heartbeat", "label": task.label,
         }))
 
         # Inject system message into chat session
-        chat_session = session_manager.get_or_create("api:default")
-        chat_session.add_message("assistant", "[System] Heartbeat task started")
-        session_manager.save(chat_session)
-        await event_bus.publish(AgentEvent("system_message", "injected", {
-            "task_id": task.id, "content": "[System] Heartbeat task started",
-        }))
+        _inject_system_message(session_manager, event_bus, task.id, "[System] Heartbeat task started")
 
         try:
             response = await agent.process_direct(
@@ -325,29 +349,19 @@ def _make_heartbeat_callback(config, agent, task_store, session_manager, event_b
                 chat_id=chat_id,
                 metadata={"task_id": task.id},
             )
-            summary = _strip_think_tags(response or "")[:120]
+            summary = strip_think_tags(response or "")[:120]
             task_store.update(task.id, status="completed", summary=summary)
-            await event_bus.publish(AgentEvent("task", "completed", {
+            event_bus.publish(AgentEvent("task", "completed", {
                 "task_id": task.id, "summary": summary,
             }))
-            chat_session = session_manager.get_or_create("api:default")
-            chat_session.add_message("assistant", f"[System] Heartbeat completed: {summary}")
-            session_manager.save(chat_session)
-            await event_bus.publish(AgentEvent("system_message", "injected", {
-                "task_id": task.id, "content": f"[System] Heartbeat completed: {summary}",
-            }))
+            _inject_system_message(session_manager, event_bus, task.id, f"[System] Heartbeat completed: {summary}")
             return response
         except Exception as e:
             task_store.update(task.id, status="failed", error=str(e))
-            await event_bus.publish(AgentEvent("task", "failed", {
+            event_bus.publish(AgentEvent("task", "failed", {
                 "task_id": task.id, "error": str(e),
             }))
-            chat_session = session_manager.get_or_create("api:default")
-            chat_session.add_message("assistant", f"[System] Heartbeat failed: {e}")
-            session_manager.save(chat_session)
-            await event_bus.publish(AgentEvent("system_message", "injected", {
-                "task_id": task.id, "content": f"[System] Heartbeat failed: {e}",
-            }))
+            _inject_system_message(session_manager, event_bus, task.id, f"[System] Heartbeat failed: {e}")
             return ""
     return on_heartbeat
 
@@ -366,7 +380,6 @@ def gateway(
     from nanobot.config.loader import load_config, get_data_dir
     from nanobot.bus.queue import MessageBus
     from nanobot.bus.event_bus import EventBus
-    from nanobot.agent.loop import AgentLoop
     from nanobot.channels.manager import ChannelManager
     from nanobot.session.manager import SessionManager
     from nanobot.cron.service import CronService
@@ -394,22 +407,8 @@ def gateway(
     cron = CronService(cron_store_path, event_bus=event_bus)
     
     # Create agent with cron service
-    agent = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=config.workspace_path,
-        model=config.agents.defaults.model or None,
-        max_iterations=config.agents.defaults.max_tool_iterations,
-        web_search_config=config.tools.web.search,
-        exec_config=config.tools.exec,
-        cron_service=cron,
-        restrict_to_workspace=config.tools.restrict_to_workspace,
-        session_manager=session_manager,
-        event_bus=event_bus,
-        max_tokens=config.agents.defaults.max_tokens,
-        temperature=config.agents.defaults.temperature,
-        context_window=config.agents.defaults.context_window,
-    )
+    agent = _make_agent(config, bus, provider, cron_service=cron,
+                        session_manager=session_manager, event_bus=event_bus)
     
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
@@ -422,18 +421,13 @@ def gateway(
         task = task_store.add("cron", f"Cron: {job.name}", "")
         session_key = f"cron:{task.id}"
         task.session_key = session_key
-        task_store._save()
-        await event_bus.publish(AgentEvent("task", "started", {
+        task_store.save()
+        event_bus.publish(AgentEvent("task", "started", {
             "task_id": task.id, "type": "cron", "label": task.label,
         }))
 
         # Inject system message into chat session
-        chat_session = session_manager.get_or_create("api:default")
-        chat_session.add_message("assistant", f"[System] Cron task started: {job.name}")
-        session_manager.save(chat_session)
-        await event_bus.publish(AgentEvent("system_message", "injected", {
-            "task_id": task.id, "content": f"[System] Cron task started: {job.name}",
-        }))
+        _inject_system_message(session_manager, event_bus, task.id, f"[System] Cron task started: {job.name}")
 
         try:
             response = await agent.process_direct(
@@ -443,29 +437,19 @@ def gateway(
                 chat_id=chat_id,
                 metadata={"task_id": task.id},
             )
-            summary = _strip_think_tags(response or "")[:120]
+            summary = strip_think_tags(response or "")[:120]
             task_store.update(task.id, status="completed", summary=summary)
-            await event_bus.publish(AgentEvent("task", "completed", {
+            event_bus.publish(AgentEvent("task", "completed", {
                 "task_id": task.id, "summary": summary,
             }))
             # Inject completion system message
-            chat_session = session_manager.get_or_create("api:default")
-            chat_session.add_message("assistant", f"[System] Cron completed: {summary}")
-            session_manager.save(chat_session)
-            await event_bus.publish(AgentEvent("system_message", "injected", {
-                "task_id": task.id, "content": f"[System] Cron completed: {summary}",
-            }))
+            _inject_system_message(session_manager, event_bus, task.id, f"[System] Cron completed: {summary}")
         except Exception as e:
             task_store.update(task.id, status="failed", error=str(e))
-            await event_bus.publish(AgentEvent("task", "failed", {
+            event_bus.publish(AgentEvent("task", "failed", {
                 "task_id": task.id, "error": str(e),
             }))
-            chat_session = session_manager.get_or_create("api:default")
-            chat_session.add_message("assistant", f"[System] Cron failed: {e}")
-            session_manager.save(chat_session)
-            await event_bus.publish(AgentEvent("system_message", "injected", {
-                "task_id": task.id, "content": f"[System] Cron failed: {e}",
-            }))
+            _inject_system_message(session_manager, event_bus, task.id, f"[System] Cron failed: {e}")
             response = None
 
         if job.payload.deliver and job.payload.to:
@@ -508,19 +492,31 @@ def gateway(
         console.print("[dim]Heartbeat: disabled[/dim]")
     
     async def run():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:  # Windows: Ctrl+C still raises KeyboardInterrupt
+                pass
+
         try:
             await cron.start()
             await heartbeat.start()
-            await asyncio.gather(
-                agent.run(),
-                channels.start_all(),
-            )
-        except KeyboardInterrupt:
-            console.print("\nShutting down...")
+            # A failing task cancels its siblings; Ctrl+C/SIGTERM ends both cleanly
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(agent.run()), tg.create_task(channels.start_all())]
+                await stop.wait()
+                console.print("\nShutting down...")
+                for task in tasks:
+                    task.cancel()
+        finally:
             heartbeat.stop()
             cron.stop()
             agent.stop()
             await channels.stop_all()
+            await provider.aclose()
+            task_store.flush()
     
     asyncio.run(run())
 
@@ -542,7 +538,6 @@ def agent(
     """Interact with the agent directly."""
     from nanobot.config.loader import load_config
     from nanobot.bus.queue import MessageBus
-    from nanobot.agent.loop import AgentLoop
     from loguru import logger
     
     config = load_config()
@@ -555,18 +550,7 @@ def agent(
     else:
         logger.disable("nanobot")
     
-    agent_loop = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=config.workspace_path,
-        model=config.agents.defaults.model or None,
-        web_search_config=config.tools.web.search,
-        exec_config=config.tools.exec,
-        restrict_to_workspace=config.tools.restrict_to_workspace,
-        max_tokens=config.agents.defaults.max_tokens,
-        temperature=config.agents.defaults.temperature,
-        context_window=config.agents.defaults.context_window,
-    )
+    agent_loop = _make_agent(config, bus, provider)
     
     # Show spinner when logs are off (no output to miss); skip when logs are on
     def _thinking_ctx():
@@ -637,6 +621,7 @@ app.add_typer(channels_app, name="channels")
 @channels_app.command("status")
 def channels_status():
     """Show channel status."""
+    from rich.table import Table
     from nanobot.config.loader import load_config
 
     config = load_config()
@@ -700,6 +685,29 @@ def channels_status():
     console.print(table)
 
 
+def _run_streamed(cmd: list[str], cwd: Path) -> None:
+    """Run a command, echoing its output dimmed as it arrives. Raises CalledProcessError."""
+    import subprocess
+    from rich.markup import escape
+
+    with subprocess.Popen(
+        cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
+    ) as proc:
+        for line in proc.stdout:
+            console.print(f"    [dim]{escape(line.rstrip())}[/dim]")
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink src to dst, copying instead when linking fails (e.g. across devices)."""
+    import shutil
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
 def _get_bridge_dir() -> Path:
     """Get the bridge directory, setting it up if needed."""
     import shutil
@@ -738,21 +746,21 @@ def _get_bridge_dir() -> Path:
     user_bridge.parent.mkdir(parents=True, exist_ok=True)
     if user_bridge.exists():
         shutil.rmtree(user_bridge)
-    shutil.copytree(source, user_bridge, ignore=shutil.ignore_patterns("node_modules", "dist"))
+    shutil.copytree(source, user_bridge, ignore=shutil.ignore_patterns("node_modules", "dist"),
+                    copy_function=_link_or_copy)
     
-    # Install and build
+    # Install and build; npm ci is faster and deterministic when a lockfile ships
+    install = ["npm", "ci"] if (user_bridge / "package-lock.json").exists() else ["npm", "install"]
     try:
         console.print("  Installing dependencies...")
-        subprocess.run(["npm", "install"], cwd=user_bridge, check=True, capture_output=True)
+        _run_streamed(install, user_bridge)
         
         console.print("  Building...")
-        subprocess.run(["npm", "run", "build"], cwd=user_bridge, check=True, capture_output=True)
+        _run_streamed(["npm", "run", "build"], user_bridge)
         
         console.print("[green]✓[/green] Bridge ready\n")
     except subprocess.CalledProcessError as e:
         console.print(f"[red]Build failed: {e}[/red]")
-        if e.stderr:
-            console.print(f"[dim]{e.stderr.decode()[:500]}[/dim]")
         raise typer.Exit(1)
     
     return user_bridge
@@ -784,15 +792,40 @@ cron_app = typer.Typer(help="Manage scheduled tasks")
 app.add_typer(cron_app, name="cron")
 
 
+def _cron_job_row(job, format_time: Callable[[int], str]) -> tuple[str, str, str, str, str]:
+    """Format one job as (id, name, schedule, status, next run) table cells.
+
+    format_time turns an epoch-ms timestamp into the "Next Run" text; cron_list
+    builds it once with time.strftime/localtime bound, rather than per row.
+    """
+    if job.schedule.kind == "every":
+        sched = f"every {(job.schedule.every_ms or 0) // 1000}s"
+    elif job.schedule.kind == "cron":
+        sched = job.schedule.expr or ""
+    else:
+        sched = "one-time"
+
+    next_ms = job.state.next_run_at_ms
+    next_run = format_time(next_ms) if next_ms else ""
+    status = "[green]enabled[/green]" if job.enabled else "[dim]disabled[/dim]"
+    return job.id, job.name, sched, status, next_run
+
+
 @cron_app.command("list")
 def cron_list(
     all: bool = typer.Option(False, "--all", "-a", help="Include disabled jobs"),
 ):
     """List scheduled jobs."""
+    import time
+    from rich.table import Table
     from nanobot.config.loader import get_data_dir
-    from nanobot.cron.service import CronService
     
     store_path = get_data_dir() / "cron" / "jobs.json"
+    if not store_path.exists():  # nothing scheduled yet; skip loading the service
+        console.print("No scheduled jobs.")
+        return
+
+    from nanobot.cron.service import CronService
     service = CronService(store_path)
     
     jobs = service.list_jobs(include_disabled=all)
@@ -808,25 +841,13 @@ def cron_list(
     table.add_column("Status")
     table.add_column("Next Run")
     
-    import time
+    strftime, localtime = time.strftime, time.localtime
+
+    def format_time(ms: int) -> str:
+        return strftime("%Y-%m-%d %H:%M", localtime(ms / 1000))
+
     for job in jobs:
-        # Format schedule
-        if job.schedule.kind == "every":
-            sched = f"every {(job.schedule.every_ms or 0) // 1000}s"
-        elif job.schedule.kind == "cron":
-            sched = job.schedule.expr or ""
-        else:
-            sched = "one-time"
-        
-        # Format next run
-        next_run = ""
-        if job.state.next_run_at_ms:
-            next_time = time.strftime("%Y-%m-%d %H:%M", time.localtime(job.state.next_run_at_ms / 1000))
-            next_run = next_time
-        
-        status = "[green]enabled[/green]" if job.enabled else "[dim]disabled[/dim]"
-        
-        table.add_row(job.id, job.name, sched, status, next_run)
+        table.add_row(*_cron_job_row(job, format_time))
     
     console.print(table)
 
@@ -924,10 +945,7 @@ def cron_run(
     store_path = get_data_dir() / "cron" / "jobs.json"
     service = CronService(store_path)
     
-    async def run():
-        return await service.run_job(job_id, force=force)
-    
-    if asyncio.run(run()):
+    if asyncio.run(service.run_job(job_id, force=force)):
         console.print(f"[green]✓[/green] Job executed")
     else:
         console.print(f"[red]Failed to run job {job_id}[/red]")
@@ -948,10 +966,10 @@ def heartbeat_trigger():
     from nanobot.config.loader import load_config, get_data_dir
     from nanobot.bus.queue import MessageBus
     from nanobot.bus.event_bus import EventBus, AgentEvent
-    from nanobot.agent.loop import AgentLoop
     from nanobot.session.manager import SessionManager
     from nanobot.heartbeat.service import HeartbeatService
     from nanobot.task.store import TaskStore
+    from rich.markdown import Markdown
 
     # Silence loguru INFO — event bus output replaces it
     _logger.disable("nanobot")
@@ -963,21 +981,8 @@ def heartbeat_trigger():
     session_manager = SessionManager(config.workspace_path)
     task_store = TaskStore(get_data_dir() / "tasks.json")
 
-    agent = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=config.workspace_path,
-        model=config.agents.defaults.model or None,
-        max_iterations=config.agents.defaults.max_tool_iterations,
-        web_search_config=config.tools.web.search,
-        exec_config=config.tools.exec,
-        restrict_to_workspace=config.tools.restrict_to_workspace,
-        session_manager=session_manager,
-        event_bus=event_bus,
-        max_tokens=config.agents.defaults.max_tokens,
-        temperature=config.agents.defaults.temperature,
-        context_window=config.agents.defaults.context_window,
-    )
+    agent = _make_agent(config, bus, provider,
+                        session_manager=session_manager, event_bus=event_bus)
 
     on_heartbeat = _make_heartbeat_callback(config, agent, task_store, session_manager, event_bus)
     heartbeat_svc = HeartbeatService(
@@ -1008,11 +1013,13 @@ def heartbeat_trigger():
                 n = event.data.get("iterations", "?")
                 console.print(f"  [green]done[/green] [dim]({n} iterations)[/dim]")
 
-    event_bus.subscribe(on_event)
+    event_bus.subscribe(on_event, categories=("agent",))
     console.print(f"{__logo__} Running heartbeat...\n")
 
     async def run():
-        return await heartbeat_svc.trigger_now()
+        response = await heartbeat_svc.trigger_now()
+        await event_bus.drain()  # let the progress printer catch up
+        return response
 
     response = asyncio.run(run())
     if response:
@@ -1025,6 +1032,7 @@ def heartbeat_trigger():
 @heartbeat_app.command("status")
 def heartbeat_status():
     """Show heartbeat configuration and last run."""
+    import time
     from nanobot.config.loader import load_config, get_data_dir
     from nanobot.task.store import TaskStore
 
@@ -1043,20 +1051,23 @@ def heartbeat_status():
     hb_file = config.workspace_path / "HEARTBEAT.md"
     if hb_file.exists():
         content = hb_file.read_text().strip()
-        lines = len(content.splitlines()) if content else 0
+        lines = content.count("\n") + 1 if content else 0
         console.print(f"HEARTBEAT.md: [green]exists[/green] ({lines} lines)")
     else:
         console.print("HEARTBEAT.md: [dim]not found[/dim]")
 
     # Show last run from task store
-    task_store = TaskStore(get_data_dir() / "tasks.json")
-    recent = [t for t in task_store.list_recent(limit=10) if t.type == "heartbeat"]
+    tasks_path = get_data_dir() / "tasks.json"
+    recent = []
+    if tasks_path.exists():
+        task_store = TaskStore(tasks_path)
+        recent = [t for t in task_store.list_recent(limit=10) if t.type == "heartbeat"]
 
     if recent:
         console.print(f"\n[bold]Recent runs:[/bold]")
-        import time
+        strftime, localtime = time.strftime, time.localtime
         for task in recent[:5]:
-            ts = time.strftime("%Y-%m-%d %H:%M", time.localtime(task.created_at_ms / 1000))
+            ts = strftime("%Y-%m-%d %H:%M", localtime(task.created_at_ms / 1000))
             dot = {"completed": "[green]●[/green]", "failed": "[red]●[/red]", "running": "[yellow]●[/yellow]"}.get(task.status, "○")
             summary = f" — {task.summary}" if task.summary else ""
             if task.error:
@@ -5,6 +5,10 @@ from pathlib import Path
 from typing import Any
 
 from nanobot.config.schema import Config
+from nanobot.utils import fastjson
+
+# Parsed configs keyed by path, valid while the file's (mtime_ns, size) match.
+_config_cache: dict[Path, tuple[tuple[int, int], Config]] = {}
 
 
 def get_config_path() -> Path:
@@ -26,21 +30,30 @@ def load_config(config_path: Path | None = None) -> Config:
         config_path: Optional path to config file. Uses default if not provided.
     
     Returns:
-        Loaded configuration object.
+        Loaded configuration object. Repeated calls return the same instance
+        until the file changes on disk.
     """
     path = config_path or get_config_path()
-    
-    if path.exists():
-        try:
-            with open(path) as f:
-                data = json.load(f)
-            data = _migrate_config(data)
-            return Config.model_validate(convert_keys(data))
-        except (json.JSONDecodeError, ValueError) as e:
-            print(f"Warning: Failed to load config from {path}: {e}")
-            print("Using default configuration.")
-    
-    return Config()
+    try:
+        st = path.stat()
+    except OSError:
+        return Config()
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    try:
+        data = _migrate_config(fastjson.loads(path.read_bytes()))
+        config = Config.model_validate(convert_keys(data))
+    except ValueError as e:
+        print(f"Warning: Failed to load config from {path}: {e}")
+        print("Using default configuration.")
+        return Config()
+
+    _config_cache[path] = (stamp, config)
+    return config
 
 
 def save_config(config: Config, config_path: Path | None = None) -> None:
@@ -60,6 +73,7 @@ def save_config(config: Config, config_path: Path | None = None) -> None:
     
     with open(path, "w") as f:
         json.dump(data, f, indent=2)
+    _config_cache.pop(path, None)
 
 
 def _migrate_config(data: dict) -> dict:
@@ -1,6 +1,8 @@
 """Configuration schema using Pydantic."""
 
 from pathlib import Path
+from typing import NamedTuple
+
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
@@ -147,6 +149,8 @@ class ApiConfig(BaseModel):
     host: str = "0.0.0.0"
     port: int = 18790
     allow_from: list[str] = Field(default_factory=list)
+    batch_ms: int = 0  # >0: coalesce frames sent within this window into one "batch" frame
+    compression: bool = True  # permessage-deflate; disable to save CPU on localhost-only setups
 
 
 class ChannelsConfig(BaseModel):
@@ -171,6 +175,7 @@ class AgentDefaults(BaseModel):
     context_window: int | None = None  # override; None = auto-discover from provider
     temperature: float = 0.7
     max_tool_iterations: int = 20
+    max_concurrent_messages: int = 4  # inbound messages processed in parallel
 
 
 class AgentsConfig(BaseModel):
@@ -240,6 +245,13 @@ class ToolsConfig(BaseModel):
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
 
 
+class ResolvedProvider(NamedTuple):
+    """Provider matched for a model: its config, registry name and api_base."""
+    config: "ProviderConfig | None"
+    name: str | None
+    api_base: str | None
+
+
 class Config(BaseSettings):
     """Root configuration for nanobot."""
     agents: AgentsConfig = Field(default_factory=AgentsConfig)
@@ -289,18 +301,22 @@ class Config(BaseSettings):
     
     def get_api_base(self, model: str | None = None) -> str | None:
         """Get API base URL for the given model. Applies default URLs for known gateways."""
+        return self.resolve_provider(model).api_base
+
+    def resolve_provider(self, model: str | None = None) -> ResolvedProvider:
+        """Match the provider once and return its config, name and api_base together."""
         from nanobot.providers.registry import find_by_name
         p, name = self._match_provider(model)
         if p and p.api_base:
-            return p.api_base
+            return ResolvedProvider(p, name, p.api_base)
         # Only gateways get a default api_base here. Standard providers
         # (like Moonshot) set their base URL via env vars in _setup_env
         # to avoid polluting the global litellm.api_base.
         if name:
             spec = find_by_name(name)
             if spec and spec.is_gateway and spec.default_api_base:
-                return spec.default_api_base
-        return None
+                return ResolvedProvider(p, name, spec.default_api_base)
+        return ResolvedProvider(p, name, None)
     
     class Config:
         env_prefix = "NANOBOT_"
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import os
 import time
 import uuid
 from pathlib import Path
@@ -15,10 +15,11 @@ if TYPE_CHECKING:
     from nanobot.bus.event_bus import EventBus
 
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from nanobot.utils import fastjson
 
 
 def _now_ms() -> int:
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
 
 
 def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
@@ -67,7 +68,7 @@ class CronService:
         
         if self.store_path.exists():
             try:
-                data = json.loads(self.store_path.read_text())
+                data = fastjson.loads(self.store_path.read_bytes())
                 jobs = []
                 for j in data.get("jobs", []):
                     jobs.append(CronJob(
@@ -149,7 +150,9 @@ class CronService:
             ]
         }
         
-        self.store_path.write_text(json.dumps(data, indent=2))
+        tmp_path = self.store_path.with_suffix(".tmp")
+        tmp_path.write_bytes(fastjson.dumpb(data, indent=True))
+        os.replace(tmp_path, self.store_path)
     
     async def start(self) -> None:
         """Start the cron service."""
@@ -235,7 +238,7 @@ class CronService:
             logger.info(f"Cron: job '{job.name}' completed")
             if self.event_bus:
                 from nanobot.bus.event_bus import AgentEvent
-                await self.event_bus.publish(AgentEvent("cron", "executed", {
+                self.event_bus.publish(AgentEvent("cron", "executed", {
                     "job": job.name, "status": "ok",
                 }))
 
@@ -245,7 +248,7 @@ class CronService:
             logger.error(f"Cron: job '{job.name}' failed: {e}")
             if self.event_bus:
                 from nanobot.bus.event_bus import AgentEvent
-                await self.event_bus.publish(AgentEvent("cron", "executed", {
+                self.event_bus.publish(AgentEvent("cron", "executed", {
                     "job": job.name, "status": "error",
                 }))
         
@@ -131,7 +131,7 @@ class HeartbeatService:
                 prompt = self._build_prompt(content)
                 if self.event_bus:
                     from nanobot.bus.event_bus import AgentEvent
-                    await self.event_bus.publish(AgentEvent("heartbeat", "tick", {
+                    self.event_bus.publish(AgentEvent("heartbeat", "tick", {
                         "tasks_found": True, "summary": "Checking tasks...",
                     }))
 
@@ -142,14 +142,14 @@ class HeartbeatService:
                     logger.info("Heartbeat: OK (no action needed)")
                     if self.event_bus:
                         from nanobot.bus.event_bus import AgentEvent
-                        await self.event_bus.publish(AgentEvent("heartbeat", "tick", {
+                        self.event_bus.publish(AgentEvent("heartbeat", "tick", {
                             "tasks_found": False,
                         }))
                 else:
                     logger.info(f"Heartbeat: completed task")
                     if self.event_bus:
                         from nanobot.bus.event_bus import AgentEvent
-                        await self.event_bus.publish(AgentEvent("heartbeat", "tick", {
+                        self.event_bus.publish(AgentEvent("heartbeat", "tick", {
                             "tasks_found": True, "summary": "Tasks completed",
                         }))
 
@@ -13,7 +13,7 @@ class ProviderCapabilities:
     context_window: int  # total tokens (input + output)
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallRequest:
     """A tool call request from the LLM."""
     id: str
@@ -21,7 +21,7 @@ class ToolCallRequest:
     arguments: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     """Response from an LLM provider."""
     content: str | None
@@ -36,7 +36,7 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
-@dataclass
+@dataclass(slots=True)
 class StreamChunk:
     """A single chunk from a streaming LLM response."""
     delta_content: str | None = None
@@ -89,6 +89,9 @@ class LLMProvider(ABC):
         """Query provider for model capabilities. Override in subclasses."""
         return None
 
+    async def aclose(self) -> None:
+        """Release any network resources held by the provider."""
+
     async def stream_chat(
         self,
         messages: list[dict[str, Any]],
@@ -1,14 +1,14 @@
-"""LiteLLM provider implementation for multi-provider support."""
+"""LiteLLM provider implementation for multi-provider support.
+
+litellm takes seconds to import, so it is imported inside the methods that use
+it; importing this module (and nanobot.providers) stays cheap.
+"""
 
-import json
 import os
 import time
 from collections.abc import AsyncGenerator
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import httpx
-import litellm
-from litellm import acompletion
 from loguru import logger
 
 from nanobot.providers.base import (
@@ -19,6 +19,10 @@ from nanobot.providers.base import (
     ToolCallRequest,
 )
 from nanobot.providers.registry import find_by_model, find_gateway
+from nanobot.utils import fastjson
+
+if TYPE_CHECKING:
+    import httpx
 
 # Cache TTL for auto-discovered capabilities (seconds)
 _DISCOVERY_TTL = 300  # 5 minutes
@@ -50,21 +54,47 @@ class LiteLLMProvider(LLMProvider):
         # api_key / api_base are fallback for auto-detection.
         self._gateway = find_gateway(provider_name, api_key, api_base)
 
-        # Configure environment variables
-        if api_key:
-            self._setup_env(api_key, api_base, default_model)
+        # Environment and litellm globals are set up on first request
+        self._configured = False
 
-        if api_base:
-            litellm.api_base = api_base
+        # Per-model results of _resolve_model / _apply_model_overrides
+        self._resolved_models: dict[str, str] = {}
+        self._model_overrides: dict[str, dict[str, Any]] = {}
 
-        # Discovery cache
+        # Discovery cache; the HTTP client is created on first use and reused
         self._capabilities: ProviderCapabilities | None = None
         self._capabilities_ts: float = 0.0
+        self._http: "httpx.AsyncClient | None" = None
+
+    def _ensure_configured(self) -> None:
+        """Apply env vars and litellm globals once, before the first request."""
+        if self._configured:
+            return
+        import litellm
+
+        # Configure environment variables
+        if self.api_key:
+            self._setup_env(self.api_key, self.api_base, self.default_model)
+
+        if self.api_base:
+            litellm.api_base = self.api_base
+
+        # Per-request kwargs that never change for this provider.
+        # api_key is passed directly — more reliable than env vars alone;
+        # extra_headers carries e.g. APP-Code for AiHubMix
+        self._base_kwargs: dict[str, Any] = {}
+        if self.api_key:
+            self._base_kwargs["api_key"] = self.api_key
+        if self.api_base:
+            self._base_kwargs["api_base"] = self.api_base
+        if self.extra_headers:
+            self._base_kwargs["extra_headers"] = self.extra_headers
 
         # Disable LiteLLM logging noise
         litellm.suppress_debug_info = True
         # Drop unsupported parameters for providers (e.g., gpt-5 rejects some params)
         litellm.drop_params = True
+        self._configured = True
 
     def _setup_env(self, api_key: str, api_base: str | None, model: str) -> None:
         """Set environment variables based on detected provider."""
@@ -88,7 +118,13 @@ class LiteLLMProvider(LLMProvider):
             os.environ.setdefault(env_name, resolved)
 
     def _resolve_model(self, model: str) -> str:
-        """Resolve model name by applying provider/gateway prefixes."""
+        """Resolve model name by applying provider/gateway prefixes (memoized)."""
+        resolved = self._resolved_models.get(model)
+        if resolved is None:
+            resolved = self._resolved_models[model] = self._prefix_model(model)
+        return resolved
+
+    def _prefix_model(self, model: str) -> str:
         if self._gateway:
             # Gateway mode: apply gateway prefix, skip provider-specific prefixes
             prefix = self._gateway.litellm_prefix
@@ -108,26 +144,69 @@ class LiteLLMProvider(LLMProvider):
 
     def _apply_model_overrides(self, model: str, kwargs: dict[str, Any]) -> None:
         """Apply model-specific parameter overrides from the registry."""
-        model_lower = model.lower()
+        overrides = self._model_overrides.get(model)
+        if overrides is None:
+            overrides = self._model_overrides[model] = self._find_overrides(model)
+        if overrides:
+            kwargs.update(overrides)
+
+    @staticmethod
+    def _find_overrides(model: str) -> dict[str, Any]:
         spec = find_by_model(model)
-        if spec:
-            for pattern, overrides in spec.model_overrides:
-                if pattern in model_lower:
-                    kwargs.update(overrides)
-                    return
+        if not spec or not spec.model_overrides:
+            return {}
+        model_lower = model.lower()
+        for pattern, overrides in spec.model_overrides:
+            if pattern in model_lower:
+                return overrides
+        return {}
+
+    def _request_kwargs(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build acompletion() kwargs on top of the precomputed per-provider ones."""
+        self._ensure_configured()
+        model = self._resolve_model(model or self.default_model)
+        kwargs: dict[str, Any] = {
+            **self._base_kwargs,
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        # Apply model-specific overrides (e.g. kimi-k2.5 temperature)
+        self._apply_model_overrides(model, kwargs)
+        if tools:
+            kwargs["tools"] = tools
+            kwargs["tool_choice"] = "auto"
+        return kwargs
 
     async def discover(self) -> ProviderCapabilities | None:
         """Query the provider for model capabilities (model name, context window).
 
         Results are cached for _DISCOVERY_TTL seconds. Returns None if the
-        provider does not expose a /v1/models endpoint (e.g. hosted APIs).
+        provider does not expose a /v1/models endpoint (e.g. hosted APIs) or
+        is a gateway whose model list says nothing about the configured model.
         """
+        import httpx
+        import litellm
+
         # Return cache if fresh
         if self._capabilities and (time.monotonic() - self._capabilities_ts) < _DISCOVERY_TTL:
             return self._capabilities
 
+        self._ensure_configured()
+
         if not self.api_base:
             return None
+        # Hosted gateways list every model they route; only local servers report theirs
+        if self._gateway and not self._gateway.supports_discovery:
+            return None
 
         base = self.api_base.rstrip("/")
         url = f"{base}/models"
@@ -136,10 +215,11 @@ class LiteLLMProvider(LLMProvider):
             headers["Authorization"] = f"Bearer {self.api_key}"
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(url, headers=headers)
-                resp.raise_for_status()
-                body = resp.json()
+            if self._http is None:
+                self._http = httpx.AsyncClient(timeout=10)
+            resp = await self._http.get(url, headers=headers)
+            resp.raise_for_status()
+            body = resp.json()
 
             models = body.get("data", [])
             if not models:
@@ -179,6 +259,12 @@ class LiteLLMProvider(LLMProvider):
             logger.debug(f"Model discovery failed: {e}")
             return self._capabilities  # return stale cache if any
 
+    async def aclose(self) -> None:
+        """Close the discovery HTTP client."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
     def invalidate(self) -> None:
         """Expire the cache so the next discover() re-queries the provider.
 
@@ -209,36 +295,12 @@ class LiteLLMProvider(LLMProvider):
         Returns:
             LLMResponse with content and/or tool calls.
         """
-        model = self._resolve_model(model or self.default_model)
-
-        kwargs: dict[str, Any] = {
-            "model": model,
-            "messages": messages,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-        }
-
-        # Apply model-specific overrides (e.g. kimi-k2.5 temperature)
-        self._apply_model_overrides(model, kwargs)
+        import litellm
 
-        # Pass api_key directly — more reliable than env vars alone
-        if self.api_key:
-            kwargs["api_key"] = self.api_key
-
-        # Pass api_base for custom endpoints
-        if self.api_base:
-            kwargs["api_base"] = self.api_base
-
-        # Pass extra headers (e.g. APP-Code for AiHubMix)
-        if self.extra_headers:
-            kwargs["extra_headers"] = self.extra_headers
-
-        if tools:
-            kwargs["tools"] = tools
-            kwargs["tool_choice"] = "auto"
+        kwargs = self._request_kwargs(messages, tools, model, max_tokens, temperature)
 
         try:
-            response = await acompletion(**kwargs)
+            response = await litellm.acompletion(**kwargs)
             return self._parse_response(response)
         except litellm.ContextWindowExceededError as e:
             logger.warning(f"Context window exceeded: {e}")
@@ -266,8 +328,8 @@ class LiteLLMProvider(LLMProvider):
                 args = tc.function.arguments
                 if isinstance(args, str):
                     try:
-                        args = json.loads(args)
-                    except json.JSONDecodeError:
+                        args = fastjson.loads(args)
+                    except ValueError:
                         args = {"raw": args}
 
                 tool_calls.append(ToolCallRequest(
@@ -303,33 +365,17 @@ class LiteLLMProvider(LLMProvider):
         temperature: float = 0.7,
     ) -> AsyncGenerator[StreamChunk, None]:
         """Stream a chat completion via LiteLLM."""
-        model = self._resolve_model(model or self.default_model)
-
-        kwargs: dict[str, Any] = {
-            "model": model,
-            "messages": messages,
-            "max_tokens": max_tokens,
-            "temperature": temperature,
-            "stream": True,
-        }
-
-        self._apply_model_overrides(model, kwargs)
+        import litellm
 
-        if self.api_key:
-            kwargs["api_key"] = self.api_key
-        if self.api_base:
-            kwargs["api_base"] = self.api_base
-        if self.extra_headers:
-            kwargs["extra_headers"] = self.extra_headers
-        if tools:
-            kwargs["tools"] = tools
-            kwargs["tool_choice"] = "auto"
+        kwargs = self._request_kwargs(messages, tools, model, max_tokens, temperature)
+        kwargs["stream"] = True
 
-        # Accumulated tool calls across chunks
-        accumulated_tool_calls: dict[int, dict[str, Any]] = {}
+        # Accumulated tool calls across chunks; argument fragments are joined at the end
+        # (indexed by tc_delta.index, which providers number densely from 0)
+        accumulated_tool_calls: list[dict[str, Any]] = []
 
         try:
-            response = await acompletion(**kwargs)
+            response = await litellm.acompletion(**kwargs)
             async for chunk in response:
                 choice = chunk.choices[0] if chunk.choices else None
                 if not choice:
@@ -339,23 +385,21 @@ class LiteLLMProvider(LLMProvider):
                 finish_reason = choice.finish_reason
 
                 # Accumulate tool call deltas
-                if hasattr(delta, "tool_calls") and delta.tool_calls:
-                    for tc_delta in delta.tool_calls:
-                        idx = tc_delta.index
-                        if idx not in accumulated_tool_calls:
-                            accumulated_tool_calls[idx] = {
-                                "id": tc_delta.id or "",
-                                "name": "",
-                                "arguments": "",
-                            }
+                tc_deltas = getattr(delta, "tool_calls", None)
+                if tc_deltas:
+                    for tc_delta in tc_deltas:
+                        idx = tc_delta.index or 0
+                        while len(accumulated_tool_calls) <= idx:
+                            accumulated_tool_calls.append({"id": "", "name": "", "arguments": []})
                         entry = accumulated_tool_calls[idx]
                         if tc_delta.id:
                             entry["id"] = tc_delta.id
-                        if hasattr(tc_delta, "function") and tc_delta.function:
-                            if tc_delta.function.name:
-                                entry["name"] = tc_delta.function.name
-                            if tc_delta.function.arguments:
-                                entry["arguments"] += tc_delta.function.arguments
+                        function = getattr(tc_delta, "function", None)
+                        if function:
+                            if function.name:
+                                entry["name"] = function.name
+                            if function.arguments:
+                                entry["arguments"].append(function.arguments)
 
                 delta_content = getattr(delta, "content", None)
 
@@ -363,11 +407,14 @@ class LiteLLMProvider(LLMProvider):
                 tc_list = None
                 if accumulated_tool_calls and finish_reason:
                     tc_list = []
-                    for _idx, tc in sorted(accumulated_tool_calls.items()):
+                    for tc in accumulated_tool_calls:
+                        if not (tc["id"] or tc["name"]):
+                            continue  # slot skipped by a sparse index
+                        raw = "".join(tc["arguments"])
                         try:
-                            args = json.loads(tc["arguments"]) if tc["arguments"] else {}
-                        except json.JSONDecodeError:
-                            args = {"raw": tc["arguments"]}
+                            args = fastjson.loads(raw) if raw else {}
+                        except ValueError:
+                            args = {"raw": raw}
                         tc_list.append(ToolCallRequest(
                             id=tc["id"], name=tc["name"], arguments=args,
                         ))
@@ -47,6 +47,7 @@ class ProviderSpec:
 
     # gateway behavior
     strip_model_prefix: bool = False         # strip "provider/" before re-prefixing
+    supports_discovery: bool = False         # GET {api_base}/models lists the served model first
 
     # per-model param overrides, e.g. (("kimi-k2.5", {"temperature": 1.0}),)
     model_overrides: tuple[tuple[str, dict[str, Any]], ...] = ()
@@ -278,6 +279,7 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         detect_by_base_keyword="",
         default_api_base="",                # user must provide in config
         strip_model_prefix=False,
+        supports_discovery=True,
         model_overrides=(),
     ),
 
@@ -1,6 +1,8 @@
 """Session management for conversation history."""
 
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -8,6 +10,7 @@ from typing import Any
 
 from loguru import logger
 
+from nanobot.utils import fastjson
 from nanobot.utils.helpers import ensure_dir, safe_filename
 
 
@@ -24,6 +27,10 @@ class Session:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Cached history_json(), reset whenever messages change, plus the encoded
+    # form of each message so appends only encode the new ones
+    _history_json: str | None = field(default=None, init=False, repr=False, compare=False)
+    _encoded: list[str] = field(default_factory=list, init=False, repr=False, compare=False)
     
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -35,6 +42,7 @@ class Session:
         }
         self.messages.append(msg)
         self.updated_at = datetime.now()
+        self._history_json = None
     
     def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
         """
@@ -52,10 +60,26 @@ class Session:
         # Convert to LLM format (just role and content)
         return [{"role": m["role"], "content": m["content"]} for m in recent]
     
+    def history_json(self) -> str:
+        """
+        Get the full history as a JSON array of {role, content} objects.
+        
+        The encoded string is cached until the next message is added, so
+        clients reconnecting to a long session don't re-serialize it.
+        """
+        if self._history_json is None:
+            encoded = self._encoded
+            for m in self.messages[len(encoded):]:
+                encoded.append(fastjson.dumps({"role": m["role"], "content": m["content"]}))
+            self._history_json = "[" + ",".join(encoded) + "]"
+        return self._history_json
+    
     def clear(self) -> None:
         """Clear all messages in the session."""
         self.messages = []
         self.updated_at = datetime.now()
+        self._history_json = None
+        self._encoded = []
 
 
 class SessionManager:
@@ -69,6 +93,13 @@ class SessionManager:
         self.workspace = workspace
         self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "sessions")
         self._cache: dict[str, Session] = {}
+        # Background persistence: every save and delete runs on one writer
+        # thread, so writes to a session file never interleave; repeated saves
+        # are coalesced. Values are (created_at, updated_at, messages, metadata).
+        self._dirty: dict[str, tuple] = {}
+        self._dirty_lock = threading.Lock()
+        self._flush_scheduled = False
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-writer")
     
     def _get_session_path(self, key: str) -> Path:
         """Get the file path for a session."""
@@ -134,24 +165,67 @@ class SessionManager:
             return None
     
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
-        path = self._get_session_path(session.key)
+        """Save a session to disk, returning once it has been written."""
+        self.save_later(session)
+        self.flush()
+
+    def save_later(self, session: Session) -> None:
+        """
+        Queue a session to be saved on a background thread.
+
+        Returns immediately. The messages and metadata are copied now, so later
+        changes on the caller's side are picked up by the next save, not this
+        one. Sessions queued while a write is in progress are written together
+        in the next pass. Call flush() to wait for them.
+        """
+        self._cache[session.key] = session
+        snapshot = (session.created_at, session.updated_at,
+                    list(session.messages), dict(session.metadata))
+        with self._dirty_lock:
+            self._dirty[session.key] = snapshot
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self._writer.submit(self._write_dirty)
+
+    def flush(self) -> None:
+        """Block until every queued save has been written."""
+        self._writer.submit(self._write_dirty).result()
+
+    def _write_dirty(self) -> None:
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, {}
+            self._flush_scheduled = False
+        for key, snapshot in dirty.items():
+            try:
+                self._write(key, *snapshot)
+            except Exception as e:
+                logger.error(f"Failed to save session {key}: {e}")
+
+    def _write(
+        self,
+        key: str,
+        created_at: datetime,
+        updated_at: datetime,
+        messages: list[dict[str, Any]],
+        metadata: dict[str, Any],
+    ) -> None:
+        """Write a session snapshot to its JSONL file. Runs on the writer thread."""
+        path = self._get_session_path(key)
         
         with open(path, "w") as f:
             # Write metadata first
             metadata_line = {
                 "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata
+                "created_at": created_at.isoformat(),
+                "updated_at": updated_at.isoformat(),
+                "metadata": metadata
             }
             f.write(json.dumps(metadata_line) + "\n")
             
             # Write messages
-            for msg in session.messages:
+            for msg in messages:
                 f.write(json.dumps(msg) + "\n")
-        
-        self._cache[session.key] = session
     
     def delete(self, key: str) -> bool:
         """
@@ -163,10 +237,15 @@ class SessionManager:
         Returns:
             True if deleted, False if not found.
         """
-        # Remove from cache
+        # Remove from cache and drop any queued save so it can't recreate the file
         self._cache.pop(key, None)
+        with self._dirty_lock:
+            self._dirty.pop(key, None)
         
-        # Remove file
+        # Remove file on the writer thread, after any write already in progress
+        return self._writer.submit(self._unlink, key).result()
+
+    def _unlink(self, key: str) -> bool:
         path = self._get_session_path(key)
         if path.exists():
             path.unlink()
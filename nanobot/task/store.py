@@ -2,21 +2,47 @@
 
 from __future__ import annotations
 
-import json
+import os
+import secrets
+import sys
+import threading
 import time
-import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
 from typing import Literal
 
 from loguru import logger
 
 from nanobot.task.types import Task
+from nanobot.utils import fastjson
 
 _MAX_TASKS = 200
+_SAVE_DELAY = 0.2  # seconds; saves requested within this window share one write
+
+
+# On-disk keys, paired positionally with the Task fields fetched by _task_fields
+_JSON_KEYS = (
+    "id", "type", "status", "label", "sessionKey",
+    "createdAtMs", "completedAtMs", "summary", "metadata", "error",
+)
+_task_fields = attrgetter(
+    "id", "type", "status", "label", "session_key",
+    "created_at_ms", "completed_at_ms", "summary", "metadata", "error",
+)
+
+
+def _task_json(task: Task) -> dict:
+    """Copy a Task into a plain dict with the store's camelCase keys."""
+    row = dict(zip(_JSON_KEYS, _task_fields(task)))
+    row["metadata"] = dict(task.metadata)
+    return row
 
 
 def _now_ms() -> int:
-    return int(time.time() * 1000)
+    return time.time_ns() // 1_000_000
 
 
 class TaskStore:
@@ -24,7 +50,14 @@ class TaskStore:
 
     def __init__(self, store_path: Path) -> None:
         self._path = store_path
-        self._tasks: list[Task] = []
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+        self._tasks: deque[Task] = deque(maxlen=_MAX_TASKS)  # oldest evicted on append
+        self._by_id: dict[str, Task] = {}
+        # Background persistence: one writer thread, pending snapshots coalesced
+        # so a burst of updates (e.g. add + save + update) costs a single write.
+        self._pending: dict | None = None
+        self._pending_lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-writer")
         self._load()
 
     # -- public API --
@@ -37,8 +70,11 @@ class TaskStore:
         metadata: dict | None = None,
     ) -> Task:
         """Create and persist a new running task. Returns the task."""
+        task_id = f"{type[:2]}-{secrets.token_hex(3)}"
+        while task_id in self._by_id:  # ids are short; never let one shadow another
+            task_id = f"{type[:2]}-{secrets.token_hex(3)}"
         task = Task(
-            id=f"{type[:2]}-{uuid.uuid4().hex[:6]}",
+            id=task_id,
             type=type,
             status="running",
             label=label,
@@ -46,16 +82,19 @@ class TaskStore:
             created_at_ms=_now_ms(),
             metadata=metadata or {},
         )
+        if len(self._tasks) == _MAX_TASKS:
+            # The deque evicts the oldest task on append; drop its index entry
+            # only if it still points at that task (a loaded file may repeat ids)
+            old = self._tasks[0]
+            if self._by_id.get(old.id) is old:
+                del self._by_id[old.id]
         self._tasks.append(task)
-        self._prune()
-        self._save()
+        self._by_id[task.id] = task
+        self.save()
         return task
 
     def get(self, task_id: str) -> Task | None:
-        for t in self._tasks:
-            if t.id == task_id:
-                return t
-        return None
+        return self._by_id.get(task_id)
 
     def update(
         self,
@@ -75,26 +114,38 @@ class TaskStore:
             task.error = error
         if status in ("completed", "failed"):
             task.completed_at_ms = _now_ms()
-        self._save()
+        self.save()
         return task
 
+    def save(self) -> None:
+        """Queue the current task list to be written on a background thread."""
+        data = self._snapshot()
+        with self._pending_lock:
+            scheduled = self._pending is not None
+            self._pending = data
+        if not scheduled:
+            self._writer.submit(self._write_pending, _SAVE_DELAY)
+
+    def flush(self) -> None:
+        """Block until every queued save has been written."""
+        self._writer.submit(self._write_pending).result()
+
     def list_recent(self, limit: int = 50) -> list[Task]:
         """Return most recent tasks, newest first."""
-        return list(reversed(self._tasks))[:limit]
+        return list(islice(reversed(self._tasks), limit))
 
     # -- serialization --
 
     def _load(self) -> None:
         if not self._path.exists():
-            self._tasks = []
             return
         try:
-            raw = json.loads(self._path.read_text())
-            self._tasks = [
+            raw = fastjson.loads(self._path.read_bytes())
+            self._tasks = deque((
                 Task(
                     id=t["id"],
-                    type=t["type"],
-                    status=t["status"],
+                    type=sys.intern(t["type"]),  # few distinct values: share one str each
+                    status=sys.intern(t["status"]),
                     label=t["label"],
                     session_key=t["sessionKey"],
                     created_at_ms=t["createdAtMs"],
@@ -104,34 +155,27 @@ class TaskStore:
                     error=t.get("error"),
                 )
                 for t in raw.get("tasks", [])
-            ]
+            ), maxlen=_MAX_TASKS)
         except Exception as e:
             logger.warning(f"Failed to load task store: {e}")
-            self._tasks = []
-
-    def _save(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        data = {
-            "version": 1,
-            "tasks": [
-                {
-                    "id": t.id,
-                    "type": t.type,
-                    "status": t.status,
-                    "label": t.label,
-                    "sessionKey": t.session_key,
-                    "createdAtMs": t.created_at_ms,
-                    "completedAtMs": t.completed_at_ms,
-                    "summary": t.summary,
-                    "metadata": t.metadata,
-                    "error": t.error,
-                }
-                for t in self._tasks
-            ],
-        }
-        self._path.write_text(json.dumps(data, indent=2))
-
-    def _prune(self) -> None:
-        """Keep only the most recent _MAX_TASKS entries."""
-        if len(self._tasks) > _MAX_TASKS:
-            self._tasks = self._tasks[-_MAX_TASKS:]
+            self._tasks.clear()
+        self._by_id = {t.id: t for t in self._tasks}
+
+    def _snapshot(self) -> dict:
+        # Rows are copied here, on the caller's thread, so the writer never
+        # reads a Task that update() is halfway through changing
+        return {"version": 1, "tasks": [_task_json(t) for t in self._tasks]}
+
+    def _write_pending(self, delay: float = 0.0) -> None:
+        if delay:
+            time.sleep(delay)  # on the writer thread: let a burst of saves collect
+        with self._pending_lock:
+            data, self._pending = self._pending, None
+        if data is None:
+            return
+        try:
+            tmp_path = self._path.with_suffix(".tmp")
+            tmp_path.write_bytes(fastjson.dumpb(data))
+            os.replace(tmp_path, self._path)
+        except Exception as e:
+            logger.error(f"Failed to save task store: {e}")
@@ -0,0 +1,36 @@
+"""JSON helpers that use orjson when it is installed, falling back to the stdlib."""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install nanobot-ai[fast]
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string, keeping non-ASCII characters as-is."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:  # e.g. non-str dict keys; the stdlib is more lenient
+            pass
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def dumpb(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes, optionally indented by two spaces."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode()
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON from a str or bytes. Raises ValueError on invalid input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
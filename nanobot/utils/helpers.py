@@ -1,7 +1,14 @@
 """Utility functions for nanobot."""
 
+import re
 from pathlib import Path
 from datetime import datetime
+from typing import Any
+
+from nanobot.utils import fastjson
+
+_JSON_CTRL = re.compile(r"[\x00-\x1f]")
+_SHORT_ESCAPES = frozenset("\b\f\n\r\t")
 
 
 def ensure_dir(path: Path) -> Path:
@@ -66,6 +73,83 @@ def truncate_string(s: str, max_len: int = 100, suffix: str = "...") -> str:
     return s[: max_len - len(suffix)] + suffix
 
 
+def strip_think_tags(text: str) -> str:
+    """Strip <think>...</think> blocks (reasoning models, e.g. Qwen) from model output.
+
+    Each block and the whitespace after it is removed; an unclosed <think> is
+    left as-is. Uses str.find rather than a regex with a lazy wildcard.
+    """
+    start = text.find("<think>")
+    if start < 0:
+        return text.strip()
+
+    parts: list[str] = []
+    pos = 0
+    n = len(text)
+    while start >= 0:
+        end = text.find("</think>", start + 7)
+        if end < 0:
+            break
+        parts.append(text[pos:start])
+        pos = end + 8
+        while pos < n and text[pos].isspace():
+            pos += 1
+        start = text.find("<think>", pos)
+    parts.append(text[pos:])
+    return "".join(parts).strip()
+
+
+def json_char_len(obj: Any) -> int:
+    """Length of json.dumps(obj, ensure_ascii=False) in characters.
+
+    With orjson installed the compact encoding is measured and the spaces the
+    stdlib puts after ':' and ',' are added back, so both paths agree.
+    """
+    if fastjson.orjson is not None:
+        try:
+            return len(fastjson.orjson.dumps(obj).decode()) + _separator_spaces(obj)
+        except TypeError:
+            pass
+    return _walk_char_len(obj)
+
+
+def _separator_spaces(obj: Any) -> int:
+    """Spaces json.dumps adds after ': ' and ', ' that compact JSON omits."""
+    if isinstance(obj, dict):
+        n = len(obj)
+        return 2 * n - (n > 0) + sum(_separator_spaces(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        n = len(obj)
+        return n - (n > 0) + sum(_separator_spaces(v) for v in obj)
+    return 0
+
+
+def _walk_char_len(obj: Any) -> int:
+    """Length of json.dumps(obj, ensure_ascii=False), computed without encoding it."""
+    if isinstance(obj, str):
+        return _str_char_len(obj)
+    if isinstance(obj, dict):
+        # '"key": value' per pair, ', ' between pairs, braces around
+        n = len(obj)
+        return (2 + 4 * n - 2 * (n > 0)
+                + sum(_str_char_len(k if isinstance(k, str) else str(k)) + _walk_char_len(v)
+                      for k, v in obj.items()))
+    if isinstance(obj, (list, tuple)):
+        n = len(obj)
+        return 2 + 2 * n - 2 * (n > 0) + sum(_walk_char_len(v) for v in obj)
+    return len(str(obj))
+
+
+def _str_char_len(s: str) -> int:
+    """Length of s as a JSON string literal: quotes plus escape sequences."""
+    n = len(s) + 2 + s.count('"') + s.count("\\")
+    ctrl = _JSON_CTRL.findall(s)
+    if ctrl:
+        # \n, \t, ... take two characters; other control chars become \u00XX
+        n += sum(1 if c in _SHORT_ESCAPES else 5 for c in ctrl)
+    return n
+
+
 def safe_filename(name: str) -> str:
     """Convert a string to a safe filename."""
     # Replace unsafe characters
@@ -0,0 +1,180 @@
+import json
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.utils.helpers import json_char_len
+
+
+def _msgs(n_history: int, size: int = 30) -> list[dict]:
+    history = [{"role": "user", "content": "x" * size} for _ in range(n_history)]
+    return [{"role": "system", "content": "sys"}, *history, {"role": "user", "content": "now"}]
+
+
+def test_truncate_keeps_everything_within_budget():
+    messages = _msgs(5)
+    assert AgentLoop._truncate_to_budget(messages, 10_000) == messages
+
+
+def test_truncate_drops_oldest_history_first():
+    messages = _msgs(10)
+    per_msg = json_char_len(messages[1]) // 3
+    fixed = (json_char_len(messages[0])
+             + json_char_len(messages[-1])) // 3
+
+    result = AgentLoop._truncate_to_budget(messages, fixed + per_msg * 3)
+
+    assert result[0] is messages[0]
+    assert result[-1] is messages[-1]
+    assert result[1:-1] == messages[-4:-1]
+
+
+def test_truncate_keeps_system_and_current_when_budget_exhausted():
+    messages = _msgs(3)
+    assert AgentLoop._truncate_to_budget(messages, 1) == [messages[0], messages[-1]]
+
+
+def test_char_len_tracks_json_length():
+    messages = [
+        {"role": "user", "content": "hello " * 40},
+        {"role": "assistant", "content": "", "tool_calls": [
+            {"id": "c1", "type": "function",
+             "function": {"name": "read_file", "arguments": '{"path": "a.txt"}'}},
+        ]},
+    ]
+    actual = len(json.dumps(messages, ensure_ascii=False))
+    assert json_char_len(messages) == actual
+
+
+_ESCAPE_HEAVY = [
+    {"role": "tool", "tool_call_id": "c1", "name": "exec",
+     "content": 'say "hi"\n' * 40 + "C:\\Temp\\.\t\x01 é 中"},
+    {"role": "assistant", "content": None, "tool_calls": [], "n": [1, 2.5, True, {}]},
+]
+
+
+def test_json_char_len_matches_stdlib_with_and_without_orjson(monkeypatch):
+    from nanobot.utils import fastjson
+
+    expected = [len(json.dumps(o, ensure_ascii=False)) for o in (_ESCAPE_HEAVY, *_ESCAPE_HEAVY)]
+    assert [json_char_len(o) for o in (_ESCAPE_HEAVY, *_ESCAPE_HEAVY)] == expected
+    monkeypatch.setattr(fastjson, "orjson", None)
+    assert [json_char_len(o) for o in (_ESCAPE_HEAVY, *_ESCAPE_HEAVY)] == expected
+
+
+def test_walk_char_len_counts_escapes_and_separators():
+    from nanobot.utils.helpers import _walk_char_len
+
+    for obj in (_ESCAPE_HEAVY, *_ESCAPE_HEAVY):
+        assert _walk_char_len(obj) == len(json.dumps(obj, ensure_ascii=False))
+
+
+async def test_run_processes_inbound_and_exits_promptly_on_stop(tmp_path):
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock
+
+    from nanobot.bus.events import InboundMessage, OutboundMessage
+    from nanobot.bus.queue import MessageBus
+
+    bus = MessageBus()
+    loop = AgentLoop(bus=bus, provider=MagicMock(), workspace=tmp_path,
+                     session_manager=MagicMock())
+    reply = OutboundMessage(channel="cli", chat_id="direct", content="hi")
+    loop._process_message = AsyncMock(return_value=reply)
+
+    runner = asyncio.create_task(loop.run())
+    await bus.publish_inbound(InboundMessage("cli", "user", "direct", "hello"))
+    assert await asyncio.wait_for(bus.consume_outbound(), timeout=1) is reply
+
+    loop.stop()
+    await asyncio.wait_for(runner, timeout=0.5)
+
+
+class ScriptedProvider(LLMProvider):
+    """Provider that replays a fixed list of responses."""
+
+    def __init__(self, responses: list[LLMResponse]):
+        super().__init__()
+        self.responses = list(responses)
+        self.calls: list[list[dict]] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls.append(list(messages))
+        return self.responses.pop(0)
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+async def test_process_message_runs_tools_then_answers(tmp_path):
+    from unittest.mock import MagicMock
+
+    from nanobot.bus.events import InboundMessage
+    from nanobot.bus.queue import MessageBus
+
+    (tmp_path / "note.txt").write_text("secret")
+    provider = ScriptedProvider([
+        LLMResponse(content=None, tool_calls=[
+            ToolCallRequest(id="c1", name="read_file", arguments={"path": str(tmp_path / "note.txt")}),
+        ]),
+        LLMResponse(content="<think>hmm</think>The note says secret."),
+    ])
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path,
+                     session_manager=MagicMock(), context_window=100_000)
+
+    response = await loop._process_message(InboundMessage("cli", "user", "direct", "read it"))
+
+    assert response.content == "The note says secret."
+    tool_msg = provider.calls[1][-1]
+    assert tool_msg["role"] == "tool" and tool_msg["content"] == "secret"
+    args = provider.calls[1][-2]["tool_calls"][0]["function"]["arguments"]
+    assert json.loads(args) == {"path": str(tmp_path / "note.txt")}
+
+
+def test_message_buffer_tracks_appends_and_short_circuits_truncation():
+    from nanobot.agent.context import MessageBuffer
+
+    buf = MessageBuffer(_msgs(3))
+    assert buf.total_chars == sum(json_char_len(m) for m in buf)
+
+    extra = {"role": "tool", "tool_call_id": "c1", "name": "exec", "content": "ok"}
+    buf.append(extra)
+    assert buf.total_chars == sum(json_char_len(m) for m in buf)
+    assert AgentLoop._truncate_to_budget(buf, 10_000) is buf
+
+    truncated = AgentLoop._truncate_to_budget(buf, 1)
+    assert isinstance(truncated, MessageBuffer)
+    assert truncated.total_chars == sum(json_char_len(m) for m in truncated)
+
+
+async def test_run_handles_sessions_concurrently_but_serializes_each_session(tmp_path):
+    import asyncio
+    from unittest.mock import MagicMock
+
+    from nanobot.bus.events import InboundMessage, OutboundMessage
+    from nanobot.bus.queue import MessageBus
+
+    bus = MessageBus()
+    loop = AgentLoop(bus=bus, provider=MagicMock(), workspace=tmp_path,
+                     session_manager=MagicMock(), concurrency=4)
+    active: dict[str, int] = {}
+    peak = {"total": 0, "per_session": 0}
+
+    async def fake_handler(msg):
+        active[msg.chat_id] = active.get(msg.chat_id, 0) + 1
+        peak["total"] = max(peak["total"], sum(active.values()))
+        peak["per_session"] = max(peak["per_session"], active[msg.chat_id])
+        await asyncio.sleep(0.02)
+        active[msg.chat_id] -= 1
+        return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id, content="ok")
+
+    loop._process_user_message = fake_handler
+    runner = asyncio.create_task(loop.run())
+    for chat_id in ("a", "a", "b", "c"):
+        await bus.publish_inbound(InboundMessage("cli", "user", chat_id, "hi"))
+    for _ in range(4):
+        await asyncio.wait_for(bus.consume_outbound(), timeout=1)
+
+    loop.stop()
+    await asyncio.wait_for(runner, timeout=0.5)
+    assert peak["total"] >= 2
+    assert peak["per_session"] == 1
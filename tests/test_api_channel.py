@@ -0,0 +1,242 @@
+import asyncio
+import json
+
+from nanobot.bus.event_bus import AgentEvent
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.api import ApiChannel
+from nanobot.config.schema import ApiConfig
+
+
+class FakeWebSocket:
+    remote_address = ("127.0.0.1", 0)
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent: list[str] = []
+        self.closed = asyncio.Event()
+
+    async def send(self, payload: str) -> None:
+        await asyncio.sleep(self.delay)
+        self.sent.append(payload)
+
+    async def close(self) -> None:
+        self.closed.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        await self.closed.wait()
+        raise StopAsyncIteration
+
+
+def _channel(tmp_path) -> ApiChannel:
+    return ApiChannel(ApiConfig(), MessageBus(), workspace=str(tmp_path))
+
+
+async def test_slow_client_does_not_block_broadcast_and_is_dropped_on_overflow(tmp_path, monkeypatch):
+    from nanobot.channels import api
+
+    monkeypatch.setattr(api, "_OUTBOX_SIZE", 3)
+    channel = _channel(tmp_path)
+    fast, slow = FakeWebSocket(), FakeWebSocket(delay=10)
+    handlers = [asyncio.create_task(channel._handler(ws)) for ws in (fast, slow)]
+    await asyncio.sleep(0)
+
+    chunk = AgentEvent("stream", "stream_chunk", {"id": "m1", "delta": "hi"})
+    for _ in range(5):
+        await asyncio.wait_for(channel._on_agent_event(chunk), timeout=0.1)
+    await asyncio.sleep(0.01)
+
+    assert [json.loads(p) for p in fast.sent] == [{"type": "stream_chunk", "id": "m1", "delta": "hi"}] * 5
+    assert slow.closed.is_set()
+    await asyncio.wait_for(handlers[1], timeout=0.5)
+    assert len(channel._connections) == 1
+
+    await fast.close()
+    await asyncio.wait_for(handlers[0], timeout=0.5)
+    assert len(channel._connections) == 0
+
+
+async def test_link_preview_cache_hit_refreshes_recency(tmp_path, monkeypatch):
+    from nanobot.channels import api
+
+    monkeypatch.setattr(api, "_link_preview_cache", api.OrderedDict())
+    expires = api.time.monotonic() + 60
+    for url in ("https://a.example/", "https://b.example/"):
+        api._link_preview_cache[url] = ({"url": url, "title": "cached"}, expires)
+    channel = _channel(tmp_path)
+
+    result = await channel._fetch_link_preview("https://a.example/")
+
+    assert result["title"] == "cached"
+    # "b" is now the least recently used entry, first in line for eviction
+    assert list(api._link_preview_cache) == ["https://b.example/", "https://a.example/"]
+
+
+def test_parse_link_preview_prefers_open_graph_and_resolves_favicon():
+    from nanobot.channels.api import _parse_link_preview
+
+    html = """<html><head>
+      <title> Page title </title>
+      <meta name="description" content="plain description">
+      <meta property="og:title" content="OG title">
+      <meta property="og:image" content="https://cdn.example/img.png">
+      <link rel="shortcut icon" href="/fav.png">
+    </head><body><p>hi</p></body></html>"""
+
+    assert _parse_link_preview(html, "https://example.com/post") == {
+        "title": "OG title",
+        "image": "https://cdn.example/img.png",
+        "description": "plain description",
+        "favicon": "https://example.com/fav.png",
+    }
+
+
+def test_parse_link_preview_defaults_favicon_without_icon_link():
+    from nanobot.channels.api import _parse_link_preview
+
+    result = _parse_link_preview("<title>Hello</title>", "http://example.org/x")
+    assert result == {"title": "Hello", "favicon": "http://example.org/favicon.ico"}
+
+
+def test_head_scan_matches_full_parse():
+    from nanobot.channels.api import _parse_link_preview, _scan_link_preview_head
+
+    page = """<!doctype html><HTML><head>
+      <title>Fish &amp; Chips</title>
+      <meta content="From the scan" property='og:description'>
+      <META NAME="description" CONTENT="fallback">
+      <link rel="icon" href="//static.example/icon.svg">
+    </head><body><meta property="og:title" content="not in head"></body></HTML>"""
+    url = "https://example.com/"
+
+    scanned = _scan_link_preview_head(page.encode(), "utf-8", url)
+    assert scanned == {
+        "title": "Fish & Chips",
+        "description": "From the scan",
+        "favicon": "https://static.example/icon.svg",
+    }
+    assert _parse_link_preview(page, url)["description"] == scanned["description"]
+
+
+def test_head_scan_defers_to_full_parse_without_head():
+    from nanobot.channels.api import _scan_link_preview_head
+
+    assert _scan_link_preview_head(b"<title>no head end</title>", "utf-8", "https://a.example/") is None
+
+
+async def test_concurrent_link_previews_share_one_fetch_and_cache_failures(tmp_path, monkeypatch):
+    from nanobot.channels import api
+
+    monkeypatch.setattr(api, "_link_preview_cache", api.OrderedDict())
+    # Treat the (unresolvable) test host as public
+    monkeypatch.setattr(api, "_host_safety_cache", api.OrderedDict({"down.example": (True, float("inf"))}))
+    channel = _channel(tmp_path)
+    calls = 0
+
+    class FailingClient:
+        async def get(self, url):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise ConnectionError("unreachable")
+
+    channel._preview_client = FailingClient()
+    url = "https://down.example/"
+    results = await asyncio.gather(*(channel._fetch_link_preview(url) for _ in range(5)))
+    assert results == [{"url": url}] * 5
+    assert await channel._fetch_link_preview(url) == {"url": url}
+    assert calls == 1
+
+    _, expires = api._link_preview_cache[url]
+    assert expires - api.time.monotonic() <= api._LINK_PREVIEW_ERROR_TTL
+
+
+async def test_push_subscriptions_upsert_by_endpoint_and_persist_as_list(tmp_path):
+    channel = _channel(tmp_path)
+    channel._add_subscription({"endpoint": "https://push.example/1", "keys": {"p256dh": "a"}})
+    channel._add_subscription({"endpoint": "https://push.example/2", "keys": {"p256dh": "b"}})
+    channel._add_subscription({"endpoint": "https://push.example/1", "keys": {"p256dh": "c"}})
+    channel._remove_subscription("https://push.example/2")
+    # Writes are debounced; stop() flushes the pending one
+    assert not (tmp_path / "push" / "subscriptions.json").exists()
+    await channel.stop()
+
+    reloaded = _channel(tmp_path)
+    assert list(reloaded._push_subscriptions.values()) == [
+        {"endpoint": "https://push.example/1", "keys": {"p256dh": "c"}},
+    ]
+    saved = json.loads((tmp_path / "push" / "subscriptions.json").read_text())
+    assert isinstance(saved, list) and len(saved) == 1
+
+
+async def test_stream_chunk_fast_path_matches_generic_encoding(tmp_path):
+    channel = _channel(tmp_path)
+    ws = FakeWebSocket()
+    handler = asyncio.create_task(channel._handler(ws))
+    await asyncio.sleep(0)
+
+    await channel._on_agent_event(AgentEvent("stream", "stream_chunk", {"id": "m1", "delta": 'a "quoted"\nline ✓'}))
+    await channel._on_agent_event(AgentEvent("stream", "stream_chunk", {"id": "m1", "delta": "x", "task_id": "t1"}))
+    await channel.send(OutboundMessage(channel="api", chat_id="default", content='done "✓"'))
+    await asyncio.sleep(0.01)
+
+    assert [json.loads(p) for p in ws.sent] == [
+        {"type": "stream_chunk", "id": "m1", "delta": 'a "quoted"\nline ✓'},
+        {"type": "stream_chunk", "id": "m1", "delta": "x", "task_id": "t1"},
+        {"type": "response", "content": 'done "✓"'},
+    ]
+    await ws.close()
+    await handler
+
+
+async def test_is_safe_url_rejects_names_resolving_to_private_addresses():
+    assert not await ApiChannel._is_safe_url("http://127.0.0.1/")
+    assert not await ApiChannel._is_safe_url("http://localhost:8080/admin")
+    assert not await ApiChannel._is_safe_url("file:///etc/passwd")
+    assert await ApiChannel._is_safe_url("https://93.184.216.34/")
+
+
+def test_load_push_state_tolerates_missing_and_empty_files(tmp_path):
+    push_dir = tmp_path / "push"
+    push_dir.mkdir()
+    (push_dir / "subscriptions.json").write_text("")
+
+    channel = _channel(tmp_path)
+    assert channel._vapid_keys is None
+    assert channel._push_subscriptions == {}
+
+    (push_dir / "vapid.json").write_text('{"public_key": "pub", "private_key": "priv"}')
+    assert _channel(tmp_path)._vapid_keys == {"public_key": "pub", "private_key": "priv"}
+
+
+async def test_error_frames(tmp_path):
+    channel = _channel(tmp_path)
+    ws = FakeWebSocket()
+
+    await channel._process_message(ws, "c1", "{not json")
+    await channel._process_message(ws, "c1", json.dumps({"type": 'x"' + "y" * 100}))
+
+    first, second = (json.loads(p) for p in ws.sent)
+    assert first == {"type": "error", "content": "Invalid JSON"}
+    assert second == {"type": "error", "content": "Unknown type: " + 'x"' + "y" * 62}
+
+
+async def test_batch_ms_coalesces_queued_frames(tmp_path):
+    channel = ApiChannel(ApiConfig(batch_ms=20), MessageBus(), workspace=str(tmp_path))
+    ws = FakeWebSocket()
+    handler = asyncio.create_task(channel._handler(ws))
+    await asyncio.sleep(0)
+
+    for delta in ("a", "b", "c"):
+        await channel._on_agent_event(AgentEvent("stream", "stream_chunk", {"id": "m1", "delta": delta}))
+    await asyncio.sleep(0.05)
+
+    assert len(ws.sent) == 1
+    frame = json.loads(ws.sent[0])
+    assert frame["type"] == "batch"
+    assert [item["delta"] for item in frame["items"]] == ["a", "b", "c"]
+    await ws.close()
+    await handler
@@ -0,0 +1,24 @@
+from nanobot.cli.commands import _cron_job_row
+from nanobot.cron.types import CronJob, CronJobState, CronSchedule
+
+
+def test_cron_job_row_formats_schedule_status_and_next_run():
+    every = CronJob(id="a1", name="ping", schedule=CronSchedule(kind="every", every_ms=90_000))
+    cron = CronJob(id="b2", name="daily", enabled=False,
+                   schedule=CronSchedule(kind="cron", expr="0 9 * * *"),
+                   state=CronJobState(next_run_at_ms=1_700_000_000_000))
+
+    format_time = str
+
+    assert _cron_job_row(every, format_time) == ("a1", "ping", "every 90s", "[green]enabled[/green]", "")
+    assert _cron_job_row(cron, format_time)[2:] == (
+        "0 9 * * *", "[dim]disabled[/dim]", "1700000000000")
+
+
+def test_markdown_hint_catches_single_line_markdown():
+    from nanobot.cli.commands import _MARKDOWN_HINT
+
+    for text in ("+ buy milk", "1) first", "2. second", "Tom &amp; Jerry",
+                 "C:\\Temp\\.", "    indented code", "**bold**", "line\nbreak"):
+        assert _MARKDOWN_HINT.search(text), text
+    assert not _MARKDOWN_HINT.search("Sure, the meeting is at noon.")
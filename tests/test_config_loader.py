@@ -0,0 +1,25 @@
+import json
+import os
+
+from nanobot.config.loader import load_config
+from nanobot.config.schema import Config
+
+
+def test_load_config_is_cached_until_the_file_changes(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"agents": {"defaults": {"model": "a/one"}}}))
+
+    first = load_config(path)
+    assert load_config(path) is first
+
+    path.write_text(json.dumps({"agents": {"defaults": {"model": "b/two-longer"}}}))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert load_config(path).agents.defaults.model == "b/two-longer"
+
+
+def test_load_config_falls_back_to_defaults_on_bad_json(tmp_path, capsys):
+    path = tmp_path / "config.json"
+    path.write_text("{not json")
+    assert load_config(path).agents.defaults.model == Config().agents.defaults.model
+    assert "Failed to load config" in capsys.readouterr().out
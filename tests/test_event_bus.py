@@ -0,0 +1,188 @@
+import asyncio
+
+from nanobot.bus.event_bus import AgentEvent, EventBus, StreamEventBatcher
+
+
+async def test_publish_reaches_every_subscriber():
+    bus = EventBus()
+    seen: list[str] = []
+
+    async def first(event: AgentEvent) -> None:
+        seen.append(f"first:{event.event}")
+
+    async def second(event: AgentEvent) -> None:
+        seen.append(f"second:{event.event}")
+
+    bus.subscribe(first)
+    bus.subscribe(second)
+    bus.publish(AgentEvent("agent", "tool_call"))
+    await bus.drain()
+
+    assert sorted(seen) == ["first:tool_call", "second:tool_call"]
+
+
+async def test_failing_subscriber_does_not_block_others():
+    bus = EventBus()
+    seen: list[AgentEvent] = []
+
+    async def broken(event: AgentEvent) -> None:
+        raise RuntimeError("boom")
+
+    async def ok(event: AgentEvent) -> None:
+        seen.append(event)
+
+    bus.subscribe(broken)
+    bus.subscribe(ok)
+    bus.publish(AgentEvent("agent", "thinking_started"))
+    await bus.drain()
+
+    assert len(seen) == 1
+
+
+async def test_slow_subscriber_runs_concurrently():
+    bus = EventBus()
+    slow_started = asyncio.Event()
+    fast_done = asyncio.Event()
+
+    async def slow(event: AgentEvent) -> None:
+        slow_started.set()
+        await asyncio.wait_for(fast_done.wait(), timeout=1)
+
+    async def fast(event: AgentEvent) -> None:
+        fast_done.set()
+
+    bus.subscribe(slow)
+    bus.subscribe(fast)
+    bus.publish(AgentEvent("agent", "tool_result"))
+    await bus.drain()
+
+    assert slow_started.is_set() and fast_done.is_set()
+
+
+async def test_unsubscribe_stops_delivery():
+    bus = EventBus()
+    seen: list[AgentEvent] = []
+
+    async def cb(event: AgentEvent) -> None:
+        seen.append(event)
+
+    bus.subscribe(cb)
+    bus.unsubscribe(cb)
+    bus.publish(AgentEvent("agent", "tool_call"))
+    await bus.drain()
+
+    assert seen == []
+
+
+async def test_category_filter_and_stream_subscriber_flag():
+    bus = EventBus()
+    seen: list[str] = []
+
+    async def agent_only(event: AgentEvent) -> None:
+        seen.append(event.category)
+
+    bus.subscribe(agent_only, categories=("agent",))
+    assert not bus.has_stream_subscribers()
+    bus.publish(AgentEvent("stream", "stream_start"))
+    bus.publish(AgentEvent("agent", "tool_call"))
+    await bus.drain()
+    assert seen == ["agent"]
+
+    async def everything(event: AgentEvent) -> None:
+        pass
+
+    bus.subscribe(everything)
+    assert bus.has_stream_subscribers()
+    bus.unsubscribe(everything)
+    assert not bus.has_stream_subscribers()
+
+
+async def test_publish_does_not_wait_for_subscribers():
+    bus = EventBus()
+    release = asyncio.Event()
+    seen: list[str] = []
+
+    async def blocked(event: AgentEvent) -> None:
+        await release.wait()
+        seen.append(event.event)
+
+    bus.subscribe(blocked)
+    bus.publish(AgentEvent("stream", "stream_chunk"))
+    bus.publish(AgentEvent("stream", "stream_end"))
+    assert seen == []
+
+    release.set()
+    await bus.drain()
+    assert seen == ["stream_chunk", "stream_end"]
+
+
+async def test_events_beyond_backlog_are_dropped():
+    bus = EventBus(max_pending=2)
+    release = asyncio.Event()
+    seen: list[int] = []
+
+    async def blocked(event: AgentEvent) -> None:
+        await release.wait()
+        seen.append(event.data["n"])
+
+    bus.subscribe(blocked)
+    for n in range(5):
+        bus.publish(AgentEvent("agent", "tick", {"n": n}))
+    release.set()
+    await bus.drain()
+
+    assert seen == [0, 1]
+
+
+async def test_stream_batcher_coalesces_chunks_until_stream_end():
+    bus = EventBus()
+    seen: list[AgentEvent] = []
+
+    async def cb(event: AgentEvent) -> None:
+        seen.append(event)
+
+    bus.subscribe(cb)
+    batcher = StreamEventBatcher(bus, max_queue_time=60)
+    batcher.publish(AgentEvent("stream", "stream_start", {"id": "a"}))
+    for delta in ("Hel", "lo", "!"):
+        batcher.publish(AgentEvent("stream", "stream_chunk", {"id": "a", "delta": delta}))
+    batcher.publish(AgentEvent("stream", "stream_end", {"id": "a"}))
+    await bus.drain()
+
+    assert [e.event for e in seen] == ["stream_start", "stream_chunk", "stream_end"]
+    assert seen[1].data == {"id": "a", "delta": "Hello!"}
+
+
+async def test_stream_batcher_flushes_on_timer_and_batch_size():
+    bus = EventBus()
+    deltas: list[str] = []
+
+    async def cb(event: AgentEvent) -> None:
+        deltas.append(event.data["delta"])
+
+    bus.subscribe(cb)
+    batcher = StreamEventBatcher(bus, max_batch_size=2, max_queue_time=0.001)
+    for delta in ("a", "b", "c"):
+        batcher.publish(AgentEvent("stream", "stream_chunk", {"id": "s", "delta": delta}))
+    await asyncio.sleep(0.01)
+    await bus.drain()
+
+    assert deltas == ["ab", "c"]
+
+
+async def test_unsubscribe_bound_method():
+    class Listener:
+        def __init__(self) -> None:
+            self.seen: list[AgentEvent] = []
+
+        async def on_event(self, event: AgentEvent) -> None:
+            self.seen.append(event)
+
+    bus = EventBus()
+    listener = Listener()
+    bus.subscribe(listener.on_event)
+    bus.unsubscribe(listener.on_event)
+    bus.publish(AgentEvent("agent", "tool_call"))
+    await bus.drain()
+
+    assert listener.seen == []
@@ -0,0 +1,22 @@
+import re
+
+import pytest
+
+from nanobot.utils.helpers import strip_think_tags
+
+_THINK_RE = re.compile(r"<think>[\s\S]*?</think>\s*")
+
+
+@pytest.mark.parametrize("text", [
+    "plain answer",
+    "  padded  ",
+    "<think>reasoning</think>\n\nAnswer",
+    "Before <think>a</think> middle <think>b\nc</think>\t after",
+    "<think>outer <think>inner</think> tail</think> done",
+    "<think>never closed, so kept",
+    "done <think>x</think>",
+    "</think> stray close <think></think>",
+    "",
+])
+def test_strip_think_tags_matches_regex_semantics(text):
+    assert strip_think_tags(text) == _THINK_RE.sub("", text).strip()
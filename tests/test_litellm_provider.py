@@ -0,0 +1,91 @@
+import sys
+from types import ModuleType
+from unittest.mock import patch
+
+import pytest
+
+from nanobot.providers import registry
+from nanobot.providers.litellm_provider import LiteLLMProvider
+
+
+@pytest.fixture
+def fake_litellm():
+    """Stand-in for the lazily imported litellm module.
+
+    Importing the real one mid-test races litellm's own background import
+    thread and can deadlock, and takes seconds besides.
+    """
+    fake = ModuleType("litellm")
+    fake.ContextWindowExceededError = type("ContextWindowExceededError", (Exception,), {})
+    with patch.dict(sys.modules, {"litellm": fake}):
+        yield fake
+
+
+def test_model_resolution_and_overrides_are_memoized_per_model():
+    provider = LiteLLMProvider(api_key="k", default_model="kimi-k2.5")
+
+    with patch("nanobot.providers.litellm_provider.find_by_model",
+               wraps=registry.find_by_model) as find:
+        for _ in range(3):
+            model = provider._resolve_model("kimi-k2.5")
+            kwargs = {"temperature": 0.7}
+            provider._apply_model_overrides(model, kwargs)
+            assert model == "moonshot/kimi-k2.5"
+            assert kwargs == {"temperature": 1.0}
+        assert find.call_count == 2  # once to resolve, once for overrides
+
+    kwargs = {"temperature": 0.7}
+    provider._apply_model_overrides(provider._resolve_model("deepseek-chat"), kwargs)
+    assert kwargs == {"temperature": 0.7}
+
+
+def _chunk(content=None, tool_calls=None, finish_reason=None):
+    from types import SimpleNamespace as NS
+    delta = NS(content=content, tool_calls=tool_calls)
+    return NS(choices=[NS(delta=delta, finish_reason=finish_reason)])
+
+
+def _tc(index, id=None, name=None, arguments=None):
+    from types import SimpleNamespace as NS
+    return NS(index=index, id=id, function=NS(name=name, arguments=arguments))
+
+
+async def test_stream_chat_accumulates_tool_call_deltas(fake_litellm):
+    chunks = [
+        _chunk(content="Looking"),
+        _chunk(tool_calls=[_tc(0, id="c1", name="read_file", arguments='{"pa')]),
+        _chunk(tool_calls=[_tc(0, arguments='th": "a.txt"}'), _tc(1, id="c2", name="exec", arguments="")]),
+        _chunk(tool_calls=[_tc(1, arguments="not json")], finish_reason="tool_calls"),
+    ]
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    seen = {}
+
+    async def fake_acompletion(**kwargs):
+        seen.update(kwargs)
+        return stream()
+
+    fake_litellm.acompletion = fake_acompletion
+    provider = LiteLLMProvider(api_key="k", default_model="deepseek-chat")
+    out = [c async for c in provider.stream_chat([{"role": "user", "content": "hi"}])]
+
+    assert fake_litellm.drop_params is True and fake_litellm.suppress_debug_info is True
+    assert seen["api_key"] == "k" and seen["stream"] is True
+    assert seen["model"] == "deepseek/deepseek-chat" and "tools" not in seen
+    assert [c.delta_content for c in out] == ["Looking", None, None, None]
+    assert all(c.tool_calls is None for c in out[:-1])
+    calls = out[-1].tool_calls
+    assert [(c.id, c.name, c.arguments) for c in calls] == [
+        ("c1", "read_file", {"path": "a.txt"}),
+        ("c2", "exec", {"raw": "not json"}),
+    ]
+
+
+async def test_discover_skips_hosted_gateways_without_a_request(fake_litellm):
+    provider = LiteLLMProvider(api_key="sk-or-x", api_base="https://openrouter.ai/api/v1",
+                               provider_name="openrouter")
+    assert await provider.discover() is None
+    assert provider._http is None
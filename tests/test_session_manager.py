@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from nanobot.session.manager import SessionManager
+
+
+def test_save_later_persists_after_flush(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    manager = SessionManager(tmp_path)
+
+    session = manager.get_or_create("cli:direct")
+    session.add_message("user", "hello")
+    manager.save_later(session)
+    session.add_message("assistant", "hi")
+    manager.save_later(session)
+    manager.flush()
+
+    reloaded = SessionManager(tmp_path).get_or_create("cli:direct")
+    assert [m["content"] for m in reloaded.messages] == ["hello", "hi"]
+
+
+def test_history_json_is_cached_until_messages_change():
+    import json
+
+    from nanobot.session.manager import Session
+
+    session = Session(key="api:default")
+    session.add_message("user", "héllo")
+    first = session.history_json()
+    assert session.history_json() is first
+    assert json.loads(first) == [{"role": "user", "content": "héllo"}]
+
+    session.add_message("assistant", "hi")
+    assert json.loads(session.history_json())[-1] == {"role": "assistant", "content": "hi"}
+    session.clear()
+    assert session.history_json() == "[]"
+
+
+def test_save_later_snapshots_and_delete_drops_pending_save(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    manager = SessionManager(tmp_path)
+
+    session = manager.get_or_create("cli:direct")
+    session.add_message("user", "hello")
+    manager.save_later(session)
+    session.add_message("assistant", "not yet saved")
+    manager.flush()
+    reloaded = SessionManager(tmp_path).get_or_create("cli:direct")
+    assert [m["content"] for m in reloaded.messages] == ["hello"]
+
+    manager.save_later(session)
+    assert manager.delete("cli:direct")
+    manager.flush()
+    assert not manager._get_session_path("cli:direct").exists()
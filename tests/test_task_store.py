@@ -0,0 +1,83 @@
+from nanobot.task.store import TaskStore
+
+
+def test_saves_are_written_in_background_and_survive_reload(tmp_path):
+    store = TaskStore(tmp_path / "tasks.json")
+    task = store.add("cron", "Cron: ping", "")
+    task.session_key = f"cron:{task.id}"
+    store.save()
+    store.update(task.id, status="completed", summary="pong")
+    store.flush()
+
+    reloaded = TaskStore(tmp_path / "tasks.json").get(task.id)
+    assert reloaded.session_key == f"cron:{task.id}"
+    assert reloaded.status == "completed" and reloaded.summary == "pong"
+    assert reloaded.completed_at_ms is not None
+
+
+def test_burst_of_saves_is_written_once(tmp_path, monkeypatch):
+    store = TaskStore(tmp_path / "tasks.json")
+    writes = []
+    real_write = type(store._path).write_bytes
+    monkeypatch.setattr(type(store._path), "write_bytes",
+                        lambda self, data: writes.append(self) or real_write(self, data))
+
+    task = store.add("heartbeat", "Heartbeat check", "")
+    task.session_key = f"heartbeat:{task.id}"
+    store.save()
+    store.update(task.id, status="completed")
+    store.flush()
+
+    assert len(writes) == 1
+
+
+def test_get_by_id_follows_pruning(tmp_path):
+    from nanobot.task import store as store_mod
+
+    store = TaskStore(tmp_path / "tasks.json")
+    tasks = [store.add("cron", f"Cron: {i}", "") for i in range(store_mod._MAX_TASKS + 1)]
+    store.flush()
+
+    assert store.get(tasks[0].id) is None
+    assert store.get(tasks[-1].id) is tasks[-1]
+    assert [t.id for t in store.list_recent(limit=2)] == [tasks[-1].id, tasks[-2].id]
+    assert TaskStore(tmp_path / "tasks.json").get(tasks[1].id).label == "Cron: 1"
+
+
+def test_write_uses_rows_copied_at_save_time(tmp_path, monkeypatch):
+    import json
+
+    store = TaskStore(tmp_path / "tasks.json")
+    task = store.add("cron", "Cron: ping", "")
+    # Keep update() from queueing a fresh snapshot, so the pending write is
+    # the one taken by add() while update() changes the task underneath it
+    monkeypatch.setattr(store, "save", lambda: None)
+    store.update(task.id, status="completed", summary="pong")
+    store.flush()
+
+    [row] = json.loads((tmp_path / "tasks.json").read_text())["tasks"]
+    assert (row["status"], row["summary"], row["completedAtMs"]) == ("running", "", None)
+
+
+def test_add_keeps_index_consistent_with_repeated_ids(tmp_path, monkeypatch):
+    import json
+
+    from nanobot.task import store as store_mod
+
+    monkeypatch.setattr(store_mod, "_MAX_TASKS", 2)
+    row = {"id": "cr-aaaaaa", "type": "cron", "status": "completed", "label": "old",
+           "sessionKey": "", "createdAtMs": 1}
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps({"version": 1, "tasks": [row, {**row, "label": "newer"}]}))
+    store = TaskStore(path)
+
+    ids = iter(["aaaaaa", "bbbbbb", "bbbbbb", "cccccc"])
+    monkeypatch.setattr(store_mod.secrets, "token_hex", lambda n: next(ids))
+    first = store.add("cron", "first", "")   # evicts "old", whose id "newer" now owns
+    assert first.id == "cr-bbbbbb"
+    assert store.get("cr-aaaaaa").label == "newer"
+
+    second = store.add("cron", "second", "")  # id collides once, then retries
+    assert second.id == "cr-cccccc"
+    assert store.get("cr-aaaaaa") is None
+    assert store.get(first.id) is first and store.get(second.id) is second
@@ -86,3 +86,39 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+def test_registry_caches_definitions_until_tools_change() -> None:
+    reg = ToolRegistry()
+    reg.register(SampleTool())
+    defs = reg.get_definitions()
+    tokens = reg.get_definitions_token_estimate()
+    assert reg.get_definitions() is defs
+    assert tokens > 0
+
+    reg.unregister("sample")
+    assert reg.get_definitions() == []
+    assert reg.get_definitions_token_estimate() < tokens
+
+
+async def test_message_tool_routes_using_per_task_context() -> None:
+    import asyncio
+
+    from nanobot.agent.tools.message import MessageTool
+    from nanobot.agent.tools.registry import TOOL_CONTEXT
+
+    sent = []
+
+    async def send(msg) -> None:
+        sent.append((msg.channel, msg.chat_id))
+
+    tool = MessageTool(send_callback=send)
+
+    async def handle(channel: str, chat_id: str) -> None:
+        TOOL_CONTEXT.set((channel, chat_id))
+        await asyncio.sleep(0)
+        await tool.execute(content="hi")
+
+    await asyncio.gather(handle("slack", "C1"), handle("telegram", "42"))
+    assert sorted(sent) == [("slack", "C1"), ("telegram", "42")]
+    assert await tool.execute(content="hi") == "Error: No target channel/chat specified"